@@ -5,6 +5,7 @@ import logging.config
 import sys
 import time
 from builtins import input
+from concurrent.futures import ThreadPoolExecutor
 from configparser import ConfigParser
 
 from model import RestLink
@@ -36,6 +37,11 @@ DEMO_SHARABLE_OBJECT = 'demo_sharable_obj'
 DEMO_ANOTHER_SHARABLE_OBJECT = 'demo_another_sharable_obj'
 DEMO_LIGHT_WEITHT_OBJECT = 'demo_lightweight_obj'
 DEMO_OBJECT_TO_ATTACH = 'obj_to_attach'
+DEMO_CONCURRENT_FOLDER = 'demo-concurrent-folder'
+DEMO_BULK_SYSOBJECT = 'demo-bulk-sysobj'
+
+DEMO_WORKERS = 64
+DEMO_BULK_SIZE = 20
 
 VERSION_72 = '7.2'
 VERSION_73 = '7.3'
@@ -116,7 +122,8 @@ class RestDemo:
         if rest_pwd:
             self.REST_PWD = rest_pwd
 
-        self.client = RestClient.RestClient(self.REST_USER, self.REST_PWD, self.REST_URI, self.REST_REPOSITORY)
+        self.client = RestClient.RestClient(self.REST_USER, self.REST_PWD, self.REST_URI, self.REST_REPOSITORY,
+                                            pool_maxsize=DEMO_WORKERS)
 
     def _init_logger(self):
         logging.getLogger("requests").setLevel(logging.WARNING)
@@ -464,8 +471,125 @@ class RestDemo:
             logger.info("------------------")
             print_properties(logger, result, 'id', 'description', 'state')
 
+        cabinet = self.client.get_cabinet(DEMO_CABINET)
+        logger.info('\nCreate %d sysobjects in cabinet %s by batch recorder...' % (DEMO_BULK_SIZE, DEMO_CABINET))
+        with self.client.batch() as batch:
+            futures = [batch.create_sysobj(cabinet, ResourceUtility.generate_sysobject(
+                object_name='%s-%d' % (DEMO_BULK_SYSOBJECT, i))) for i in range(DEMO_BULK_SIZE)]
+        sysobjects = [future.result() for future in futures]
+        for sysobject in sysobjects:
+            print_resource_properties(logger, sysobject, 'object_name', 'r_object_id')
+
+        logger.info('\nDelete the sysobjects by batch recorder...')
+        with self.client.batch() as batch:
+            futures = [batch.delete(sysobject) for sysobject in sysobjects]
+        for future in futures:
+            future.result()
+
         logger.info("\n+++++++++++++++++++++++++++++++Batch End+++++++++++++++++++++++++++++++")
 
+    def demo_bulk_operations(self):
+        """
+        REST bulk operations
+        version: 7.2
+        """
+        logger.info("\n+++++++++++++++++++++++++++++++Bulk Operations Start+++++++++++++++++++++++++++++++")
+
+        logger.info('Get cabinet %s...' % DEMO_CABINET)
+        cabinet = self.client.get_cabinet(DEMO_CABINET)
+
+        logger.info('Create temp folder %s in cabinet %s...' % (DEMO_TEMP_FOLDER, DEMO_CABINET))
+        temp_folder = self.client.create_folder(cabinet, ResourceUtility.generate_folder(object_name=DEMO_TEMP_FOLDER))
+
+        logger.info('Create %d sysobjects in folder %s concurrently...' % (DEMO_BULK_SIZE, DEMO_TEMP_FOLDER))
+        results = self.client.map(lambda i: self.client.create_sysobj(
+            temp_folder, ResourceUtility.generate_sysobject(object_name='%s-%d' % (DEMO_BULK_SYSOBJECT, i))),
+            range(DEMO_BULK_SIZE))
+        self._check_bulk_results(results)
+
+        logger.info('Get all sysobjects in folder %s concurrently...' % DEMO_TEMP_FOLDER)
+        sysobjects = self.client.get_sysobjects(temp_folder, params={'items-per-page': DEMO_BULK_SIZE})
+        results = self.client.get_entry_resources(sysobjects)
+        self._check_bulk_results(results)
+        for result in results:
+            print_resource_properties(logger, result.value, 'object_name', 'r_object_id')
+
+        logger.info('Update all sysobjects in folder %s concurrently...' % DEMO_TEMP_FOLDER)
+        results = self.client.update_all(
+            (result.value, ResourceUtility.generate_sysobject(title='updated by bulk operation'))
+            for result in results)
+        self._check_bulk_results(results)
+
+        logger.info('Delete all sysobjects in folder %s concurrently...' % DEMO_TEMP_FOLDER)
+        self._check_bulk_results(self.client.delete_all(result.value for result in results))
+
+        logger.info('Delete folder %s' % DEMO_TEMP_FOLDER)
+        self.client.delete(temp_folder)
+
+        logger.info("+++++++++++++++++++++++++++++++Bulk Operations End+++++++++++++++++++++++++++++++")
+
+    @staticmethod
+    def _check_bulk_results(results):
+        errors = [result.error for result in results if result.error is not None]
+        logger.info('%d succeeded, %d failed.\n', len(results) - len(errors), len(errors))
+        if errors:
+            raise errors[0]
+
+    def demo_concurrent_access(self):
+        """
+        REST concurrent access
+        version: 7.2
+        """
+        logger.info("\n+++++++++++++++++++++++++++++++Concurrent Access Start+++++++++++++++++++++++++++++++")
+
+        with ThreadPoolExecutor(max_workers=DEMO_WORKERS) as executor:
+            logger.info('Discover repository %s lazily from %d threads sharing one new client...' % (
+                self.REST_REPOSITORY, DEMO_WORKERS))
+            with RestClient.RestClient(self.REST_USER, self.REST_PWD, self.REST_URI, self.REST_REPOSITORY,
+                                       pool_maxsize=DEMO_WORKERS, lazy=True) as lazy_client:
+                repositories = list(executor.map(lambda i: lazy_client.get_current_repository(),
+                                                 range(DEMO_WORKERS)))
+            if len(set(id(repository) for repository in repositories)) != 1:
+                raise Exception('Repository %s is discovered more than once.' % self.REST_REPOSITORY)
+
+            logger.info('Get cabinet %s from %d threads sharing one client...' % (DEMO_CABINET, DEMO_WORKERS))
+            cabinets = list(executor.map(lambda i: self.client.get_cabinet(DEMO_CABINET), range(DEMO_WORKERS)))
+            cabinet_ids = set(cabinet.get('properties').get('r_object_id') for cabinet in cabinets)
+            if len(cabinet_ids) != 1:
+                raise Exception('Threads got different cabinets %s.' % cabinet_ids)
+            print_resource_properties(logger, cabinets[0], 'object_name', 'r_object_id')
+
+            logger.info('Query \'select * from dm_user\' from %d threads with shared URL parameters...' % DEMO_WORKERS)
+            params = {'items-per-page': '2'}
+            results = list(executor.map(lambda i: self.client.dql('select * from dm_user', params),
+                                        range(DEMO_WORKERS)))
+            if params != {'items-per-page': '2'}:
+                raise Exception('URL parameters are modified by concurrent queries: %s.' % params)
+            logger.info('%d queries returned %d entries in total.\n', len(results),
+                        sum(result.entry_count() for result in results))
+
+            logger.info('Create temp folder %s in cabinet %s...' % (DEMO_TEMP_FOLDER, DEMO_CABINET))
+            temp_folder = self.client.create_folder(cabinets[0],
+                                                    ResourceUtility.generate_folder(object_name=DEMO_TEMP_FOLDER))
+
+            logger.info('Create %d folders in folder %s from %d threads...' % (DEMO_WORKERS, DEMO_TEMP_FOLDER,
+                                                                               DEMO_WORKERS))
+            folders = list(executor.map(
+                lambda i: self.client.create_folder(temp_folder, ResourceUtility.generate_folder(
+                    object_name='%s-%d' % (DEMO_CONCURRENT_FOLDER, i))),
+                range(DEMO_WORKERS)))
+            folder_ids = set(folder.get('properties').get('r_object_id') for folder in folders)
+            if len(folder_ids) != DEMO_WORKERS:
+                raise Exception('Expected %d folders but %d are created.' % (DEMO_WORKERS, len(folder_ids)))
+
+            logger.info('Delete %d folders from %d threads...' % (DEMO_WORKERS, DEMO_WORKERS))
+            list(executor.map(self.client.delete, folders))
+
+        logger.info('Delete folder %s' % DEMO_TEMP_FOLDER)
+        self.client.delete(temp_folder)
+
+        logger.info("+++++++++++++++++++++++++++++++Concurrent Access End+++++++++++++++++++++++++++++++")
+
     def demo_dql(self):
         """
         REST DQL
@@ -490,6 +614,25 @@ class RestDemo:
             logger.info('Object names in page %d...', 3)
             for result in results.get_entries():
                 logger.info(result.get('content').get('properties').get('user_name'))
+        logger.info('')
+
+        logger.info('Iterate all pages of \'select * from dm_user\' with items-per-page=2...')
+        results = self.client.dql('select * from dm_user', {'items-per-page': '2'})
+        user_count = sum(1 for _ in self.client.iter_entries(results))
+        logger.info('%d users in total.\n', user_count)
+
+        logger.info('Fetch all pages of \'select * from dm_user\' concurrently with items-per-page=2...')
+        results = self.client.dql('select * from dm_user', {'items-per-page': '2', 'include-total': 'true'})
+        user_count = sum(1 for _ in self.client.iter_entries_parallel(results))
+        logger.info('%d users in total.\n', user_count)
+
+        logger.info('Iterate \'select user_name from dm_user\' with keyset pagination of page size 2...')
+        user_count = sum(1 for _ in self.client.dql_keyset('select user_name from dm_user', page_size=2))
+        logger.info('%d users in total.\n', user_count)
+
+        logger.info('Iterate \'select user_name from dm_user\' in 4 concurrent shards...')
+        user_count = sum(1 for _ in self.client.dql_sharded('select user_name from dm_user', shards=4, page_size=2))
+        logger.info('%d users in total.\n', user_count)
 
         logger.info("+++++++++++++++++++++++++++++++DQL End+++++++++++++++++++++++++++++++")
 
@@ -1026,7 +1169,7 @@ class RestDemo:
 
         if cabinet is not None:
             logger.debug('Deleting cabinet %s.', DEMO_CABINET)
-            self.client.delete_folder_recursively(cabinet)
+            self.client.delete_folder_recursively(cabinet, all_versions=True)
         else:
             logger.debug('Cabinet %s does not exist.', DEMO_CABINET)
 
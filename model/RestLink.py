@@ -5,14 +5,33 @@ This is a module for REST related link classes.
 import re
 from network import RestRequest
 
+try:
+    from sys import intern
+except ImportError:
+    # intern is a builtin in Python 2
+    pass
+
 __author__ = 'wangc31'
 
 
+def intern_rel(rel):
+    """
+    Intern the link relation string, so that the long relation strings of all links share one instance
+    :param rel: link relation string
+    :return: interned link relation string
+    """
+    if isinstance(rel, str):
+        return intern(rel)
+    return rel
+
+
 class LinkRelation(object):
     """This class represents link relation."""
 
+    __slots__ = ('rel', 'hreftemplate')
+
     def __init__(self, rel, hreftemplate):
-        self.rel = rel
+        self.rel = intern_rel(rel)
         self.hreftemplate = hreftemplate
 
     def __repr__(self):
@@ -29,6 +48,7 @@ REL_PREVIOUS = LinkRelation('previous', False)
 REL_FIRST = LinkRelation('first', False)
 REL_LAST = LinkRelation('last', False)
 REL_CONTENTS = LinkRelation('contents', False)
+REL_ENCLOSURE = LinkRelation('enclosure', False)
 REL_PRIMARY_CONTENT = LinkRelation('http://identifiers.emc.com/linkrel/primary-content', False)
 REL_FOLDERS = LinkRelation('http://identifiers.emc.com/linkrel/folders', False)
 REL_REPOSITORIES = LinkRelation('http://identifiers.emc.com/linkrel/repositories', False)
@@ -67,6 +87,8 @@ REL_BATCHES = LinkRelation('http://identifiers.emc.com/linkrel/batches', False)
 class Link(object):
     """This class represents link"""
 
+    __slots__ = ('rel', 'href', 'title', 'hreftemplate')
+
     def __init__(self, rel, href, hreftemplate=False, title=None):
         """
         Init Link
@@ -76,20 +98,35 @@ class Link(object):
         :param title: title of the link
         """
 
-        self.rel = rel
+        self.rel = intern_rel(rel)
         self.href = href
         self.title = title
         self.hreftemplate = hreftemplate
 
-    def request(self):
+    def request(self, session=None):
         """
         Get the instance of RestRequest, which contains the request url
+        :param session: the pooled HTTP session to send the request with
         :return: the instance of RestRequest
         """
         if not self.hreftemplate:
-            return RestRequest.RestRequest(self.href)
+            return RestRequest.RestRequest(self.href, session)
+        else:
+            return RestRequest.RestRequest(re.sub(r"\{.+\}$", "", str(self.href)), session)
+
+    def async_request(self, session):
+        """
+        Get the instance of AsyncRestRequest, which contains the request url
+        :param session: the aiohttp session to send the request with
+        :return: the instance of AsyncRestRequest
+        """
+        # imported here so that aiohttp is only required by the asyncio client
+        from network import AsyncRestRequest
+
+        if not self.hreftemplate:
+            return AsyncRestRequest.AsyncRestRequest(self.href, session)
         else:
-            return RestRequest.RestRequest(re.sub(r"\{.+\}$", "", str(self.href)))
+            return AsyncRestRequest.AsyncRestRequest(re.sub(r"\{.+\}$", "", str(self.href)), session)
 
     def __repr__(self):
         return 'Link(%r, %r, %r, %r)' % (self.rel, self.href, self.hreftemplate, self.title)
@@ -1,21 +1,29 @@
 import json
 import model
 
+try:
+    from collections.abc import Sequence
+except ImportError:
+    from collections import Sequence
+
 __author__ = 'wangc31'
 
 
 class Resource(object):
     """This class represents REST resource model"""
 
+    __slots__ = ('_raw_resource_', '_rest_links_', '_link_index_')
+
     def __init__(self, raw_resource):
         """
         This is the model for REST resources. Actually it stores the data of resource in a dictionary.
         Besides, a resource is linkable, which means it contains a list of links.
+        The links are built lazily when they are accessed for the first time.
         :param raw_resource: the raw resource is a dictionary.
         """
         self._raw_resource_ = raw_resource
-        self._rest_links_ = []
-        self._init_links()
+        self._rest_links_ = None
+        self._link_index_ = None
 
     def _init_links(self):
         """
@@ -23,9 +31,30 @@ class Resource(object):
         :return:
         """
         if self.is_key_existing('links'):
-            self._rest_links_ += [self._generate_link(link)
-                                  for link in self.get('links')
-                                  if self._is_valid_link(link)]
+            links = [self._generate_link(link)
+                     for link in self.get('links')
+                     if self._is_valid_link(link)]
+        else:
+            links = []
+
+        # index the first link of each relation, and the first link of each relation and title
+        link_index = {}
+        for link in links:
+            link_index.setdefault((link.rel, link.hreftemplate, None), link)
+            if link.title is not None:
+                link_index.setdefault((link.rel, link.hreftemplate, link.title), link)
+
+        self._link_index_ = link_index
+        self._rest_links_ = links
+
+    def _links(self):
+        """
+        Get the links, which are initialized on first access
+        :return: links
+        """
+        if self._rest_links_ is None:
+            self._init_links()
+        return self._rest_links_
 
     def keys(self):
         """
@@ -56,7 +85,7 @@ class Resource(object):
         Get all the links
         :return: links
         """
-        return self._rest_links_
+        return self._links()
 
     def find_link(self, link_rel, title=None):
         """
@@ -65,12 +94,8 @@ class Resource(object):
         :param title: link title
         :return: matched link
         """
-        for link in self._rest_links_:
-            if link.rel == link_rel.rel and link.hreftemplate == link_rel.hreftemplate and (
-                            title is None or title == link.title):
-                return link
-
-        return None
+        self._links()
+        return self._link_index_.get((link_rel.rel, link_rel.hreftemplate, title))
 
     def entry_count(self):
         """
@@ -91,13 +116,12 @@ class Resource(object):
     def get_entries(self):
         """
         Get the collection of entries
-        :return: entries
+        :return: sequence view of entries, which are wrapped as resources on access
         """
         if not self.is_key_existing('entries'):
             return []
 
-        return [Resource(raw_entry)
-                for raw_entry in self.get('entries')]
+        return EntryView(self.get('entries'))
 
     def is_key_existing(self, key):
         """
@@ -166,6 +190,35 @@ class Resource(object):
         return self.representation()
 
 
+class EntryView(Sequence):
+    """
+    This class is a read-only sequence of the entries of a collection resource. Raw entries are wrapped as
+    resources only when they are accessed.
+    """
+
+    def __init__(self, raw_entries):
+        """
+        Initialize the view
+        :param raw_entries: list of raw entries
+        """
+        self._raw_entries = raw_entries
+
+    def __len__(self):
+        return len(self._raw_entries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return EntryView(self._raw_entries[index])
+        return Resource(self._raw_entries[index])
+
+    def __iter__(self):
+        for raw_entry in self._raw_entries:
+            yield Resource(raw_entry)
+
+    def __repr__(self):
+        return 'EntryView(%r)' % self._raw_entries
+
+
 class Home(Resource):
     """
     This is the model of home resource
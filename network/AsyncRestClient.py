@@ -0,0 +1,1030 @@
+"""
+This is a module for the asyncio counterpart of RestClient.
+"""
+
+import asyncio
+import logging
+
+import aiohttp
+
+from model import RestLink
+from model.RestLink import Link
+from model import RestResource
+from network import RestSession
+from network.RestClient import MEDIA_TYPE_DM_JSON, MEDIA_TYPE_HOME_JSON, MEDIA_TYPE_OCTET_STREAM
+
+__author__ = 'wangc31'
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+DEFAULT_KEEPALIVE_TIMEOUT = 15
+
+
+class AsyncRestClient:
+    """
+    Client can consume Documentum REST services from asyncio code. It has the same methods as RestClient,
+    while each of them is a coroutine. All requests share one pooled aiohttp session, so many requests can
+    be in flight concurrently within one event loop.
+    """
+
+    def __init__(self, user, pwd, rest_uri, repo, pool_connections=RestSession.DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=RestSession.DEFAULT_POOL_MAXSIZE, keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT):
+        """
+        Initialize the essential info user name, user password and REST context URL.
+        The HTTP session is opened and the repository resource is populated by open(), or by entering
+        the client with 'async with'.
+        :param user: user name
+        :param pwd: user password
+        :param rest_uri: REST context URL
+        :param repo: the repository resource of the REST client
+        :param pool_connections: total number of connections kept in the pool
+        :param pool_maxsize: maximum number of connections per host
+        :param keepalive_timeout: seconds to keep idle connections alive
+        """
+        self._id = user
+        self._pwd = pwd
+        self._root_uri = rest_uri
+        self._repo = repo
+        self._pool_connections = max(pool_connections, pool_maxsize)
+        self._pool_maxsize = pool_maxsize
+        self._keepalive_timeout = keepalive_timeout
+        self._session = None
+        self._repo_resource = None
+        self._repo_lock = None
+
+    async def open(self):
+        """
+        Open the HTTP session and populate the repository resource
+        :return: the REST client
+        """
+        self._get_session()
+        await self.get_current_repository()
+        return self
+
+    async def close(self):
+        """
+        Close the pooled connections of the REST client
+        :return:
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def _get_session(self):
+        """
+        Get the pooled HTTP session, which is created in the running event loop on first use
+        :return: HTTP session
+        """
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self._pool_connections, limit_per_host=self._pool_maxsize,
+                                             keepalive_timeout=self._keepalive_timeout)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def get_home_resource(self):
+        """
+        Get home resource
+        :return: home resource
+        """
+        home_link = Link('home', self._root_uri)
+        return RestResource.Home((await self._link_get(home_link, accept=MEDIA_TYPE_HOME_JSON)).resource())
+
+    async def get_product_info(self):
+        """
+        Get production info resource
+        :return: production info resource
+        """
+        return (await self._link_get((await self.get_home_resource()).get_product_info_link())).resource()
+
+    async def get_repositories(self, params=None):
+        """
+        Get repositories resource
+        :return: repositories resource
+        """
+        home = await self.get_home_resource()
+        return await self._link_get(home.get_home_entry_link(RestLink.REL_REPOSITORIES), params=params)
+
+    async def get_repository(self, repo_name):
+        """
+        Get repository resource
+        :param repo_name: repository name
+        :return: repository resource
+        """
+        repositories = (await self.get_repositories()).resource()
+        return await self._get_resource_via_entry(repositories, 'title', repo_name)
+
+    async def get_cabinets(self, params=None):
+        """
+        Get cabinets resource
+        :param params: URL parameters
+        :return: cabinets resources
+        """
+        return await self._get_objects(await self.get_current_repository(), RestLink.REL_CABINETS, params=params)
+
+    async def get_cabinet(self, cabinet_name):
+        """
+        Get cabinet resource
+        :param cabinet_name: cabinet name
+        :return: cabinet resource
+        """
+        filter_criteria = 'starts-with(object_name,\'' + cabinet_name + '\')'
+        cabinets = await self.get_cabinets(params={'filter': filter_criteria})
+        return await self._get_resource_via_entry(cabinets, 'title', cabinet_name)
+
+    async def get_sysobjects(self, parent, params=None):
+        """
+        Get system objects
+        :param parent: the parent resource of the system objects
+        :param params: URL parameters
+        :return: system objects
+        """
+        return await self._get_objects(parent, RestLink.REL_OBJECTS, params=params)
+
+    async def get_sysobject(self, parent, object_name):
+        """
+        Get system object
+        :param parent: the parent resource of the system objects
+        :param object_name: name of system object
+        :return: system object
+        """
+        return await self._get_object(parent, RestLink.REL_OBJECTS, 'title', object_name)
+
+    async def get_sharable_parent(self, lightweight_obj):
+        """
+        Get sharable parent
+        :param lightweight_obj: the lightweight object to find its sharable parent
+        :return: sharable parent
+        """
+        return (await self._link_get(lightweight_obj.find_link(RestLink.REL_SHARED_PARENT))).resource()
+
+    async def get_documents(self, parent, params=None):
+        """
+        Get documents resource
+        :param parent: the parent resource of the documents
+        :param params: URL parameters
+        :return: documents resource
+        """
+        return await self._get_objects(parent, RestLink.REL_DOCUMENTS, params)
+
+    async def get_document(self, parent, object_name):
+        """
+        Get document resource
+        :param parent: the parent resource of the documents
+        :param object_name: object name of the document
+        :return: document resource
+        """
+        return await self._get_object(parent, RestLink.REL_DOCUMENTS, 'title', object_name)
+
+    async def get_types(self, params=None):
+        """
+        Get types resource
+        :param params: URL parameters
+        :return: types resource
+        """
+        return await self._get_objects(await self.get_current_repository(), RestLink.REL_TYPES, params=params)
+
+    async def get_type(self, type_name):
+        """
+        Get type resource
+        :param type_name: type name
+        :return: type resource
+        """
+        return await self._get_object(await self.get_current_repository(), RestLink.REL_TYPES, 'title', type_name)
+
+    async def get_value_assistance(self, dm_type, assist_value_request, included_property=None):
+        """
+        Get value assistance of one type
+        :param dm_type: the type to get its value assistance
+        :param assist_value_request: assist value request
+        :param included_property: URL parameter included-properties
+        :return: value assistance
+        """
+        return (await self._link_post(link=dm_type.find_link(RestLink.REL_ASSIST_VALUES),
+                                      data=assist_value_request.representation(),
+                                      params={'included-properties': included_property})).resource()
+
+    async def get_relations(self, params=None):
+        """
+        Get relations resource
+        :param params: URL parameters
+        :return: relations resource
+        """
+        return await self._get_objects(await self.get_current_repository(), RestLink.REL_RELATIONS, params=params)
+
+    async def get_relation(self, parent, relation_name):
+        """
+        Get relation resource
+        :param parent: parent resource of relations
+        :param relation_name: relation name
+        :return: relation resource
+        """
+        return await self._get_object(parent, RestLink.REL_RELATIONS, 'title', relation_name)
+
+    async def get_formats(self, params=None):
+        """
+        Get formats resource
+        :param params: URL parameters
+        :return: formats resource
+        """
+        return await self._get_objects(await self.get_current_repository(), RestLink.REL_FORMATS, params=params)
+
+    async def get_format(self, format_name):
+        """
+        Get format resource
+        :param format_name: format name
+        :return: format resource
+        """
+        return await self._get_object(await self.get_current_repository(), RestLink.REL_FORMATS, 'title', format_name)
+
+    async def get_network_locations(self, params=None):
+        """
+        Get network locations resource
+        :param params: URL parameters
+        :return: network locations resource
+        """
+        return await self._get_objects(await self.get_current_repository(), RestLink.REL_NETWORK_LOCATIONS,
+                                       params=params)
+
+    async def get_network_location(self, network_location_name):
+        """
+        Get network location resource
+        :param network_location_name: network location name
+        :return: network location resource
+        """
+        return await self._get_object(await self.get_current_repository(), RestLink.REL_NETWORK_LOCATIONS, 'title',
+                                      network_location_name)
+
+    async def get_relation_types(self, params=None):
+        """
+        Get relation types resource
+        :param params: URL parameters
+        :return: relation types resource
+        """
+        return await self._get_objects(await self.get_current_repository(), RestLink.REL_RELATION_TYPES, params)
+
+    async def get_relation_type(self, relation_type_name):
+        """
+        Get relation type resource
+        :param relation_type_name: relation type name
+        :return: relation type resource
+        """
+        return await self._get_object(await self.get_current_repository(), RestLink.REL_RELATION_TYPES, 'title',
+                                      relation_type_name)
+
+    async def get_users(self, parent, params=None):
+        """
+        Get users resource
+        :param parent: parent resource of users
+        :param params: URL parameters
+        :return: users resource
+        """
+        return await self._get_objects(parent, RestLink.REL_USERS, params=params)
+
+    async def get_user(self, user_name):
+        """
+        Get user resource
+        :param user_name: user name
+        :return: user resource
+        """
+        return await self._get_object(await self.get_current_repository(), RestLink.REL_USERS, 'title', user_name)
+
+    async def get_group(self, group_name):
+        """
+        Get group resource
+        :param group_name: group name
+        :return: group resource
+        """
+        return await self._get_object(await self.get_current_repository(), RestLink.REL_GROUPS, 'title', group_name)
+
+    async def get_folders(self, parent, params=None):
+        """
+        Get folders resource
+        :param parent: parent resource of folders
+        :param params: URL parameters
+        :return: folders resource
+        """
+        return await self._get_objects(parent, RestLink.REL_FOLDERS, params=params)
+
+    async def get_folder(self, parent, folder_name):
+        """
+        Get folder resource
+        :param parent: parent resource of folders
+        :param folder_name: folder name
+        :return: folder resource
+        """
+        return await self._get_object(parent, RestLink.REL_FOLDERS, 'title', folder_name)
+
+    async def get_primary_content(self, obj, params=None):
+        """
+        Get primary content resource
+        :param obj: system object owning the primary content
+        :param params: URL parameters
+        :return: primary content resource
+        """
+        return await self._follow_resource_link(obj, RestLink.REL_PRIMARY_CONTENT, params=params)
+
+    async def get_contents(self, obj, params=None):
+        """
+        Get contents resource
+        :param obj: system object owning the contents
+        :param params: URL parameters
+        :return: content resource
+        """
+        return await self._follow_resource_link(obj, RestLink.REL_CONTENTS, params=params)
+
+    async def get_aspects(self, params=None):
+        """
+        Get aspects resource
+        :param params: URL parameters
+        :return: aspects resource
+        """
+        return await self._get_objects(await self.get_current_repository(), RestLink.REL_ASPECT_TYPES, params=params)
+
+    async def get_aspect(self, aspect_name):
+        """
+        Get aspect resource
+        :param aspect_name: aspect name
+        :return: aspect resource
+        """
+        return await self._get_object(await self.get_current_repository(), RestLink.REL_ASPECT_TYPES, 'title',
+                                      aspect_name)
+
+    async def get_batch_capabilities(self, params=None):
+        """
+        Get batch capabilities
+        :param params: URL parameters
+        :return:
+        """
+        return await self._get_objects(await self.get_current_repository(), RestLink.REL_BATCH_CAPABILITIES,
+                                       params=params)
+
+    async def create_batch(self, batch):
+        return (await self._link_post((await self.get_current_repository()).find_link(RestLink.REL_BATCHES),
+                                      batch.representation())).resource()
+
+    async def create_cabinet(self, cabinet):
+        """
+        Create cabinet resource
+        :param cabinet: cabinet resource to create
+        :return: created cabinet resource
+        """
+        return (await self._create_object_by_representation(await self.get_current_repository(), RestLink.REL_CABINETS,
+                                                            cabinet)).resource()
+
+    async def create_folder(self, parent, new_folder):
+        """
+        Create folder resource
+        :param parent: parent resource of the folder
+        :param new_folder: folder resource to create
+        :return: created folder resource
+        """
+        return (await self._create_object_by_representation(parent, RestLink.REL_FOLDERS, new_folder)).resource()
+
+    async def create_sysobj(self, parent, new_sysobj, rel=None, content=None, params=None):
+        """
+        Create system object resource
+        :param parent: parent resource of the system object
+        :param new_sysobj: system object resource to created
+        :param rel: the link relation which defines the sub-type of the system object to create;
+                    default is system object
+        :param params: URL parameters
+        :param content: the content of the system object to create
+        :return: created system object resource
+        """
+        if rel is None:
+            return (await self._create_object_by_representation(parent, RestLink.REL_OBJECTS, new_sysobj, content,
+                                                                params=params)).resource()
+        else:
+            return (await self._create_object_by_representation(parent, rel,
+                                                                new_sysobj, params=params)).resource()
+
+    async def create_document(self, parent, new_doc, content=None, params=None):
+        """
+        Create system document resource
+        :param parent: parent resource of the document
+        :param new_doc: document resource to create
+        :param content: the content of the document to create
+        :param params: URL parameters
+        :return: created document resource
+        """
+        return (await self._create_object_by_representation(parent, RestLink.REL_DOCUMENTS, resource=new_doc,
+                                                            content=content, params=params)).resource()
+
+    async def create_user(self, new_user):
+        """
+        Create user resource
+        :param new_user: user resource to create
+        :return: created user resource
+        """
+        return (await self._create_object_by_representation(await self.get_current_repository(), RestLink.REL_USERS,
+                                                            new_user)).resource()
+
+    async def create_group(self, new_group):
+        """
+        Create group resource
+        :param new_group: group resource to create
+        :return: created group resource
+        """
+        return (await self._create_object_by_representation(await self.get_current_repository(), RestLink.REL_GROUPS,
+                                                            new_group)).resource()
+
+    async def create_relation(self, new_relation):
+        """
+        Create relation resource
+        :param new_relation: relation resource to create
+        :return: created relation resource
+        """
+        return (await self._create_object_by_representation(await self.get_current_repository(), RestLink.REL_RELATIONS,
+                                                            new_relation)).resource()
+
+    async def add_user_to_group(self, group, user_to_add):
+        """
+        Add user to group
+        :param group: the target group resource
+        :param user_to_add: the user resource to add
+        :return:
+        """
+        (await self._create_object_by_reference(group, RestLink.REL_USERS, user_to_add.reference())).resource()
+
+    async def add_group_to_group(self, group, group_to_add):
+        """
+        Add group to group
+        :param group: the target group resource
+        :param group_to_add: the group resource to add
+        :return:
+        """
+        (await self._create_object_by_reference(group, RestLink.REL_GROUPS, group_to_add.reference())).resource()
+
+    async def remove_user_from_group(self, group, user_to_remove):
+        """
+        Remove user from group
+        :param group: the target group
+        :param user_to_remove: the user resource to remove
+        :return:
+        """
+        await self._remove_member_from_group(group, RestLink.REL_USERS, user_to_remove)
+
+    async def remove_group_from_group(self, group, group_to_remove):
+        """
+        Remove group from group
+        :param group: the target gtoup
+        :param group_to_remove: the group resource to remove
+        :return:
+        """
+        await self._remove_member_from_group(group, RestLink.REL_GROUPS, group_to_remove)
+
+    async def create_content(self, obj, content, content_type, params):
+        """
+        Create content
+        :param obj: the system object owning the content
+        :param content: the content to remove
+        :param content_type: content type
+        :param params: URL parameters
+        :return:
+        """
+        return (await self._link_post(obj.find_link(RestLink.REL_CONTENTS), data=content, accept=MEDIA_TYPE_DM_JSON,
+                                      content_type=content_type, params=params)).resource()
+
+    async def check_out(self, obj):
+        """
+        Check out system object
+        :param obj: the system out to check out
+        :return:
+        """
+        return (await self._link_put(obj.find_link(RestLink.REL_CHECK_OUT), data=None)).resource()
+
+    async def cancel_check_out(self, obj):
+        """
+        Cancel check out
+        :param obj: the checked out system object
+        :return:
+        """
+        await self._link_delete(obj.find_link(RestLink.REL_CANCEL_CHECK_OUT))
+
+    async def check_in_minor(self, obj, new_obj, content=None, params=None):
+        """
+        Check in minor version
+        :param obj: the original system object
+        :param new_obj: the new system object to check in
+        :param content: the content
+        :param params: URL parameters
+        :return:
+        """
+        return (await self._check_in(obj, RestLink.REL_CHECK_IN_MINOR, new_obj, content, params)).resource()
+
+    async def check_in_major(self, obj, new_obj, content=None, params=None):
+        """
+        Check in major version
+        :param obj: the original system object
+        :param new_obj: the new system object to check in
+        :param content: the content
+        :param params: URL parameters
+        :return:
+        """
+        return (await self._check_in(obj, RestLink.REL_CHECK_IN_MAJOR, new_obj, content, params)).resource()
+
+    async def check_in_branch(self, obj, new_obj, content=None, params=None):
+        """
+        Check in branch
+        :param obj: the original system object
+        :param new_obj: the new system object to check in
+        :param content: the content
+        :param params: URL paramters
+        :return:
+        """
+        return (await self._check_in(obj, RestLink.REL_CHECK_IN_BRANCH, new_obj, content, params)).resource()
+
+    async def dql(self, dql, params=None):
+        """
+        Execute DQL
+        :param dql: DQL statement
+        :param params: URL parameters
+        :return: query results
+        """
+        params = dict(params or {}, dql=dql)
+
+        repo = await self.get_current_repository()
+        return (await self._link_get(repo.find_link(RestLink.REL_DQL), params=params)).resource()
+
+    async def simple_search(self, q, params=None):
+        """
+        Execute search via simple search language
+        :param q: query criteria in simple search language
+        :param params: URl parameter
+        :return: query results
+        """
+        params = dict(params or {}, q=q)
+
+        repo = await self.get_current_repository()
+        return (await self._link_get(repo.find_link(RestLink.REL_SEARCH), params=params)).resource()
+
+    async def aql_search(self, aql, params=None):
+        """
+        Execute search via AQL
+        :param aql: query criteria in abstract query language
+        :param params: URL parameters
+        :return: query results
+        """
+        return (await self._link_post((await self.get_current_repository()).find_link(RestLink.REL_SEARCH), data=aql,
+                                      params=params)).resource()
+
+    async def get_saved_searches(self, params=None):
+        """
+        Get saved searches
+        :param params: URL parameters
+        :return: saved searches resource
+        """
+        return await self._get_objects(await self.get_current_repository(), RestLink.REL_SAVED_SEARCHES, params=params)
+
+    async def get_saved_search(self, saved_search_name):
+        """
+        Get saved search resource
+        :param saved_search_name: saved search name
+        :return: saved search resource
+        """
+        return await self._get_object(await self.get_current_repository(), RestLink.REL_SAVED_SEARCHES, 'title',
+                                      saved_search_name)
+
+    async def create_saved_search(self, new_saved_search):
+        """
+        Create a new saved search
+        :param new_saved_search: the new saved search to create
+        :return: new created saved search
+        """
+        return (await self._create_object_by_representation(await self.get_current_repository(),
+                                                            RestLink.REL_SAVED_SEARCHES,
+                                                            new_saved_search)).resource()
+
+    async def execute_saved_search(self, saved_search, params=None):
+        """
+        Execute saved search
+        :param saved_search: saved search to execute
+        :param params: URL parameters
+        :return: search results
+        """
+        return (await self._link_get(saved_search.find_link(RestLink.REL_SEARCH_EXECUTION), params=params)).resource()
+
+    async def get_saved_results(self, saved_search, params=None):
+        """
+        Get saved results
+        :param saved_search: saved search
+        :param params: URL parameters
+        :return: saved search results
+        """
+        return (await self._link_get(saved_search.find_link(RestLink.REL_SAVED_SEARCH_RESULTS),
+                                     params=params)).resource()
+
+    async def enable_saved_results(self, saved_search):
+        """
+        Enable saved results
+        :param saved_search: saved search
+        :return: saved results of saved search
+        """
+        return (await self._link_put(saved_search.find_link(RestLink.REL_SAVED_SEARCH_RESULTS))).resource()
+
+    async def disable_saved_results(self, saved_search):
+        """
+        Disable saved results
+        :param saved_search: saved search
+        :return:
+        """
+        await self._link_delete(saved_search.find_link(RestLink.REL_SAVED_SEARCH_RESULTS))
+
+    async def get_search_templates(self, params=None):
+        """
+        Get search templates
+        :param params: URL parameters
+        :return: search templates
+        """
+        return await self._get_objects(await self.get_current_repository(), RestLink.REL_SEARCH_TEMPLATES,
+                                       params=params)
+
+    async def get_search_template(self, search_template_name):
+        """
+        Get search template resource
+        :param search_template_name: search template name
+        :return: search template resource
+        """
+        return await self._get_object(await self.get_current_repository(), RestLink.REL_SEARCH_TEMPLATES, 'title',
+                                      search_template_name)
+
+    async def create_search_template(self, new_search_template):
+        """
+        Create search template
+        :param new_search_template: search template to create
+        :return: created search template
+        """
+        return (await self._create_object_by_representation(await self.get_current_repository(),
+                                                            RestLink.REL_SEARCH_TEMPLATES,
+                                                            new_search_template)).resource()
+
+    async def execute_search_template(self, search_template, variables=None, params=None):
+        """
+        Execute search template
+        :param variables: variables from input
+        :param search_template: search template to execute
+        :param params: URL parameters
+        :return: search results
+        """
+        return (await self._link_post(search_template.find_link(RestLink.REL_SEARCH_EXECUTION),
+                                      data=variables.representation(),
+                                      params=params)).resource()
+
+    async def materialize(self, lightweight_obj):
+        """
+        Materialize lightweight object
+        :param lightweight_obj: the lightweight object to materialize
+        :return:
+        """
+        return (await self._link_put(lightweight_obj.find_link(RestLink.REL_MATERIALIZE))).resource()
+
+    async def dematerialize(self, lightweight_obj):
+        """
+        Dematerialize lightweight object
+        :param lightweight_obj: the lightweight object to dematerialize
+        :return:
+        """
+        return await self._link_delete(lightweight_obj.find_link(RestLink.REL_DEMATERIALIZE))
+
+    async def reparent(self, lightweight_obj, new_parent):
+        """
+        Reparent lightweight object
+        :param lightweight_obj: the lightweight object to reparent
+        :param new_parent: the new parent
+        :return:
+        """
+        return await self._create_object_by_reference(lightweight_obj, RestLink.REL_SHARED_PARENT,
+                                                      new_parent.reference())
+
+    async def attach_aspects(self, obj, object_aspects):
+        """
+        Attach aspects
+        :param obj: the target system object
+        :param object_aspects: aspects to attach
+        :return:
+        """
+        return (await self._link_post(obj.find_link(RestLink.REL_OBJECT_ASPECTS),
+                                      object_aspects.representation())).resource()
+
+    async def detach(self, obj, aspect):
+        """
+        Detach aspect
+        :param obj: the target system object
+        :param aspect: aspect to detach
+        :return:
+        """
+        await self._link_delete(obj.find_link(RestLink.REL_DELETE, aspect))
+
+    async def refresh(self, obj):
+        """
+        Refresh system object by getting it again
+        :param obj: the system object
+        :return: refreshed system object
+        """
+        return await self._follow_resource_link(obj, RestLink.REL_SELF)
+
+    async def update(self, sys_obj, new_sys_object):
+        """
+        Update system object
+        :param sys_obj: the original object
+        :param new_sys_object: the new object
+        :return: the updated object
+        """
+        return (await self._link_post(sys_obj.find_link(RestLink.REL_EDIT),
+                                      data=new_sys_object.representation())).resource()
+
+    async def delete(self, obj, params=None):
+        """
+        Delete system object
+        :param obj: the system object to delete
+        :param params: URL parameters
+        :return:
+        """
+        if obj.find_link(RestLink.REL_DELETE) is not None:
+            await self._link_delete(obj.find_link(RestLink.REL_DELETE), params=params)
+        elif obj.find_link(RestLink.REL_SELF) is not None:
+            await self._link_delete(obj.find_link(RestLink.REL_SELF), params=params)
+        else:
+            raise Exception(
+                'Object %s is not deletable as there is no link detected for the delete operation.' % obj.get(
+                    'properties').get('r_object_id'))
+
+    async def follow_link(self, link):
+        """
+        GET request for the link href
+        :param link: the link
+        :return: response of GET request
+        """
+        return (await self._link_get(link, accept=MEDIA_TYPE_DM_JSON)).resource()
+
+    async def previous_page(self, current_page):
+        """
+        Get previous page if existing
+        :param current_page: current page
+        :return: system objects in previous page
+        """
+        return (await self._link_get(current_page.find_link(RestLink.REL_PREVIOUS))).resource()
+
+    async def next_page(self, current_page):
+        """
+        GET next page if existing
+        :param current_page: current page
+        :return: system objects in next page
+        """
+        return (await self._link_get(current_page.find_link(RestLink.REL_NEXT))).resource()
+
+    async def first_page(self, current_page):
+        """
+        GET first page if existing
+        :param current_page: current page
+        :return: system objects in first page
+        """
+        return (await self._link_get(current_page.find_link(RestLink.REL_FIRST))).resource()
+
+    async def last_page(self, current_page):
+        """
+        GET last page if exiting
+        :param current_page: current page
+        :return: system objects in last page
+        """
+        return (await self._link_get(current_page.find_link(RestLink.REL_LAST))).resource()
+
+    async def delete_folder_recursively(self, folder):
+        """
+        Delete folder and its members
+        :param folder: the folder to delete
+        :return:
+        """
+        logger.info('Delete folder %s recursively.', folder.get('properties').get('object_name'))
+        if not folder:
+            return
+
+        for sub_folder_entry in (await self.get_folders(folder)).get_entries():
+            sub_folder = await self.follow_link(sub_folder_entry.find_link(RestLink.REL_EDIT))
+            await self.delete_folder_recursively(sub_folder)
+
+        for obj_entry in (await self.get_sysobjects(folder)).get_entries():
+            obj = await self.follow_link(obj_entry.find_link(RestLink.REL_EDIT))
+            await self.delete(obj)
+
+        await self.delete(folder)
+
+    async def _follow_resource_link(self, resource, rel, params=None):
+        """
+        GET the link href of a resource
+        :param resource: the resource
+        :param rel: the link relation for the target link
+        :param params: URL parameters
+        :return: requested resource
+        """
+        return (await self._link_get(resource.find_link(rel), params=params)).resource()
+
+    async def _get_objects(self, parent, rel, params=None):
+        """
+        GET the link href of parent resource for system object
+        :param parent: parent resource
+        :param rel: link relation
+        :param params: URL parameters
+        :return: system objects
+        """
+        if parent:
+            return await self._follow_resource_link(parent, rel, params)
+        else:
+            raise Exception(
+                "Parent resource does not and it can not fetch collection by link relation %s." % rel.rel)
+
+    async def get_current_repository(self):
+        """
+        Get repository resource specific to the REST client
+        :return: repository resource
+        """
+        if self._repo_resource is None:
+            if self._repo_lock is None:
+                self._repo_lock = asyncio.Lock()
+            async with self._repo_lock:
+                if self._repo_resource is None:
+                    repo = await self.get_repository(self._repo)
+                    if not repo:
+                        raise Exception(
+                            "The specified repository %s does not exist. Input an existing repository to run the demo."
+                            % self._repo)
+                    self._repo_resource = repo
+        return self._repo_resource
+
+    async def _get_object(self, parent, rel, attr_name=None, attr_value=None):
+        """
+        Follow link of parent resource and get the resource based on attribute value.
+        For example, parent is repository resource and link relation is http://identifiers.emc.com/linkrel/users,
+        it will get users of the repository resource and return the one specified by attribute value.
+        :param parent: the parent resource
+        :param rel: link relation
+        :param attr_name: attribute name to specify object
+        :param attr_value: attribute value to specify object
+        :return: the object
+        """
+        objects = await self._get_objects(parent, rel)
+        return await self._get_resource_via_entry(objects, attr_name, attr_value)
+
+    async def _create_object_by_representation(self, parent, rel, resource, content=None, params=None):
+        """
+        Create system object by POST resource representation
+        :param parent: the parent resource
+        :param rel: link relation
+        :param resource: the resource representation
+        :param content: the content
+        :param params: URL parameters
+        :return: created system object
+        """
+        if content:
+            return await self._link_post_multipart(parent.find_link(rel), resource.representation(), content,
+                                                   params=params)
+        else:
+            return await self._link_post(parent.find_link(rel), resource.representation(), params=params)
+
+    async def _create_object_by_reference(self, parent, rel, reference, params=None):
+        """
+        Create system object by resource reference
+        :param parent: the parent resource
+        :param rel: link relation
+        :param reference: the resource reference
+        :param params: URL parameters
+        :return: created system object
+        """
+        return await self._link_post(parent.find_link(rel), reference, params=params)
+
+    async def _check_in(self, obj, rel, new_obj, content=None, params=None):
+        """
+        Check in object with different strategy
+        :param obj: original object
+        :param rel: link relation
+        :param new_obj: new object
+        :param content: the content
+        :param params: URL parameters
+        :return:
+        """
+        if new_obj and content:
+            return await self._link_post_multipart(obj.find_link(rel), meta=new_obj.representation(), content=content,
+                                                   params=params)
+        elif not new_obj:
+            return await self._link_post(obj.find_link(rel), data=content, content_type=MEDIA_TYPE_OCTET_STREAM,
+                                         params=params)
+        elif not content:
+            return await self._link_post(obj.find_link(rel), data=new_obj.representation(), params=params)
+
+        return None
+
+    async def _remove_member_from_group(self, group, rel, member_name):
+        """
+        Remove members from group
+        :param group: the parent group
+        :param rel: link relation for user or group member
+        :param member_name: the name of the member to remove
+        :return:
+        """
+        members_in_group = await self._get_objects(group, rel)
+        for member_in_group in members_in_group.get_entries():
+            if member_name == member_in_group.get('title'):
+                await self.delete(member_in_group)
+
+    async def _link_get(self, link, accept=MEDIA_TYPE_DM_JSON, params=None):
+        """
+        GET the link href
+        :param link: the link
+        :param accept: HTTP header accept
+        :param params: URL parameters
+        :return: HTTP response
+        """
+        if link is not None:
+            return await link.async_request(self._get_session()).auth(self._id, self._pwd).accept(
+                accept).get(params=params)
+        else:
+            return None
+
+    async def _link_post_multipart(self, link, meta, content=None, accept=MEDIA_TYPE_DM_JSON,
+                                   content_type=MEDIA_TYPE_DM_JSON, params=None):
+        """
+        POST the link href iwht multipart
+        :param link: the link
+        :param meta: the meta date
+        :param content: the content
+        :param accept: HTTP header accept
+        :param content_type: HTTP haeder content-type
+        :param params: URL parameters
+        :return: HTTP response
+        """
+        if link is not None:
+            multipart = [
+                ('metadata', ('', meta, MEDIA_TYPE_DM_JSON)),
+                ('binary', ('', content, ''))
+            ]
+            request = link.async_request(self._get_session()).auth(self._id, self._pwd).accept(accept).as_(content_type)
+            return await request.post(files=multipart, params=params)
+        else:
+            return None
+
+    async def _link_post(self, link, data, accept=MEDIA_TYPE_DM_JSON, content_type=MEDIA_TYPE_DM_JSON, params=None):
+        """
+        POST the link href
+        :param link: the link
+        :param data: requst data
+        :param accept: HTTP header accept
+        :param content_type: HTTP header content-type
+        :param params: URL parameters
+        :return: HTTP response
+        """
+        if link is not None:
+            request = link.async_request(self._get_session()).auth(self._id, self._pwd).accept(accept).as_(content_type)
+            return await request.post(data=data, params=params)
+        else:
+            return None
+
+    async def _link_put(self, link, data=None, accept=MEDIA_TYPE_DM_JSON, content_type=MEDIA_TYPE_DM_JSON, params=None):
+        """
+        PUT the link href
+        :param link:
+        :param data: requst data
+        :param accept: HTTP header accept
+        :param content_type: HTTP header content-type
+        :param params: URL parameters
+        :return: HTTP response
+        """
+        if link is not None:
+            request = link.async_request(self._get_session()).auth(self._id, self._pwd).accept(accept).as_(content_type)
+            return await request.put(data=data, params=params)
+        else:
+            return None
+
+    async def _link_delete(self, link, params=None):
+        """
+        DELETE the link href
+        :param link: the link
+        :param params: URL parameters
+        :return: HTTP response
+        """
+        if link is not None:
+            return await link.async_request(self._get_session()).auth(self._id, self._pwd).delete(params=params)
+        else:
+            return None
+
+    async def _get_resource_via_entry(self, collection, attr_name, attr_value):
+        """
+        GET one resource from collection by filtering with attribute. All pages of the collection are searched.
+        :param collection: collection resource
+        :param attr_name: attribute name to filter
+        :param attr_value: attribute value to fileter
+        :return:
+        """
+        while collection is not None:
+            for resource_entry in collection.get_entries():
+                if attr_value == resource_entry.get(attr_name):
+                    return (await self._link_get(resource_entry.find_link(RestLink.REL_EDIT))).resource()
+            collection = await self.next_page(collection) if collection.find_link(RestLink.REL_NEXT) else None
+        return None
+
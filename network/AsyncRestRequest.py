@@ -0,0 +1,76 @@
+"""
+This is a module for the asyncio counterparts of RestRequest and RestResponse.
+"""
+
+import logging
+
+import aiohttp
+
+from network.RestRequest import RestRequest, RestResponse, BufferedResponse
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class AsyncRestRequest(RestRequest):
+    """The class is the asyncio request to Documentum REST services"""
+
+    def __init__(self, href, session):
+        """
+        Initialize asyncio REST request
+        :param href: the request href
+        :param session: the aiohttp session to send the request with
+        """
+        RestRequest.__init__(self, href, session)
+
+    async def request(self):
+        """
+        Run request. The response body is read completely before the connection is released to the pool.
+        :return: AsyncRestResponse instance
+        """
+        logger.debug('    [%s <--> URI %s]' % (self.verb.upper(), self.href))
+        headers = {k: v for k, v in self.prepare_headers().items() if v is not None}
+
+        if self._is_multipart_request():
+            data = self._get_multipart_form()
+        else:
+            data = self.data
+
+        async with self.session.request(self.verb, self.href, headers=headers, params=self._get_query_params(),
+                                        data=data) as rsp:
+            content = await rsp.read()
+
+        response = BufferedResponse(rsp.status, rsp.headers, content)
+        self.check_return_code(response)
+        return AsyncRestResponse(response)
+
+    def _get_query_params(self):
+        """
+        Get URL parameters as strings, and drop the ones without value like requests does
+        :return: URL parameters
+        """
+        if not self.params:
+            return None
+
+        return {k: str(v) for k, v in self.params.items() if v is not None}
+
+    def _get_multipart_form(self):
+        """
+        Get multipart form from the files in requests format
+        :return: multipart form
+        """
+        form = aiohttp.FormData()
+        for name, (filename, value, content_type) in self.files:
+            form.add_field(name, value, filename=filename or None, content_type=content_type or None)
+        return form
+
+
+class AsyncRestResponse(RestResponse):
+    """The class is the REST response of an asyncio request"""
+
+    def __init__(self, response):
+        """
+        Asyncio REST response
+        :param response: buffered HTTP response
+        """
+        RestResponse.__init__(self, response)
@@ -0,0 +1,353 @@
+"""
+This is a module to record REST client calls as batch operations.
+"""
+
+import json
+import logging
+import re
+from concurrent.futures import Future
+
+try:
+    from urllib.parse import urlencode, urlsplit
+except ImportError:
+    from urllib import urlencode
+    from urlparse import urlsplit
+
+from model import RestLink
+from model import RestResource
+from network.RestClient import MEDIA_TYPE_DM_JSON, DEFAULT_BATCH_SIZE
+from util import ResourceUtility
+
+__author__ = 'wangc31'
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+_OBJECT_ID = re.compile(r'^[0-9a-f]{16}$')
+
+
+class Batch(object):
+    """
+    This class records calls of a REST client as operations of batches, which are sent when a batch is full and
+    when the with block exits. Each call returns a future of its result, which is resolved once its batch is sent.
+    Operations on resources that the repository can not batch are sent one by one after the batches, or in
+    recording order between them if the batch is sequential.
+    Results of operations can not be used by later operations of the same batch.
+
+    with client.batch() as batch:
+        futures = [batch.create_folder(cabinet, folder) for folder in folders]
+    folders = [future.result() for future in futures]
+    """
+
+    def __init__(self, client, size=DEFAULT_BATCH_SIZE, transactional=False, sequential=False,
+                 on_error='CONTINUE'):
+        """
+        Initialize batch recorder. Use RestClient.batch() to create it.
+        :param client: the REST client
+        :param size: maximum number of operations in one batch
+        :param transactional: whether operations of a batch are committed or rolled back together
+        :param sequential: whether operations of a batch are executed in order
+        :param on_error: CONTINUE to run the remaining operations of a batch when one fails; FAIL to stop
+        """
+        repo = client.get_current_repository()
+        if repo.find_link(RestLink.REL_BATCHES) is None or repo.find_link(RestLink.REL_BATCH_CAPABILITIES) is None:
+            raise Exception('Batches are not supported by the repository, which has no batches or batch '
+                            'capabilities link.')
+
+        capabilities = client.get_batch_capabilities()
+        if transactional and not _is_supported(capabilities.get('transactions')):
+            raise ValueError('Transactional batches are not supported by the repository.')
+        if sequential and not _is_supported(capabilities.get('sequence')):
+            raise ValueError('Sequential batches are not supported by the repository.')
+
+        self._client = client
+        self._size = size
+        self._options = {'transactional': transactional, 'sequential': sequential, 'on-error': on_error}
+        self._batchable = set(capabilities.get('batchable-resources') or [])
+        self._non_batchable = set(capabilities.get('non-batchable-resources') or [])
+        self._pending = []
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.flush()
+        else:
+            self.cancel()
+        self._closed = True
+
+    def follow_link(self, link, params=None):
+        """
+        Record GET request for the link href
+        :param link: the link
+        :param params: URL parameters
+        :return: future of the resource
+        """
+        return self._record('GET', link, params=params, on_result=self._client._cache_object)
+
+    def create_cabinet(self, cabinet):
+        """
+        Record creating cabinet resource
+        :param cabinet: cabinet resource to create
+        :return: future of created cabinet resource
+        """
+        return self._create(self._client.get_current_repository(), RestLink.REL_CABINETS, cabinet)
+
+    def create_folder(self, parent, new_folder):
+        """
+        Record creating folder resource
+        :param parent: parent resource of the folder
+        :param new_folder: folder resource to create
+        :return: future of created folder resource
+        """
+        return self._create(parent, RestLink.REL_FOLDERS, new_folder)
+
+    def create_sysobj(self, parent, new_sysobj, rel=None, params=None):
+        """
+        Record creating system object resource without content
+        :param parent: parent resource of the system object
+        :param new_sysobj: system object resource to created
+        :param rel: the link relation which defines the sub-type of the system object to create;
+                    default is system object
+        :param params: URL parameters
+        :return: future of created system object resource
+        """
+        return self._create(parent, rel or RestLink.REL_OBJECTS, new_sysobj, params)
+
+    def create_document(self, parent, new_doc, params=None):
+        """
+        Record creating document resource without content
+        :param parent: parent resource of the document
+        :param new_doc: document resource to create
+        :param params: URL parameters
+        :return: future of created document resource
+        """
+        return self._create(parent, RestLink.REL_DOCUMENTS, new_doc, params)
+
+    def update(self, sys_obj, new_sys_object):
+        """
+        Record updating system object
+        :param sys_obj: the original object
+        :param new_sys_object: the new object
+        :return: future of the updated object
+        """
+        def _on_result(updated):
+            self._client._evict_object(sys_obj)
+            return self._client._cache_object(updated)
+
+        return self._record('POST', sys_obj.find_link(RestLink.REL_EDIT), entity=new_sys_object.representation(),
+                            on_result=_on_result)
+
+    def delete(self, obj, params=None):
+        """
+        Record deleting system object
+        :param obj: the system object to delete
+        :param params: URL parameters
+        :return: future of None
+        """
+        link = obj.find_link(RestLink.REL_DELETE) or obj.find_link(RestLink.REL_SELF)
+        if link is None:
+            raise Exception(
+                'Object %s is not deletable as there is no link detected for the delete operation.' % obj.get(
+                    'properties').get('r_object_id'))
+
+        def _on_result(_):
+            self._client._evict_object(obj)
+            return None
+
+        return self._record('DELETE', link, params=params, on_result=_on_result)
+
+    def flush(self):
+        """
+        Send the recorded operations
+        :return:
+        """
+        pending, self._pending = self._pending, []
+        # operations whose futures are cancelled are dropped
+        pending = [operation for operation in pending if operation['future'].set_running_or_notify_cancel()]
+
+        batched = []
+        for operation in pending:
+            if self._is_batchable(operation['uri']):
+                batched.append(operation)
+                if len(batched) == self._size:
+                    self._send_batch(batched)
+                    batched = []
+            elif self._options['sequential']:
+                # keep the order of operations
+                if batched:
+                    self._send_batch(batched)
+                    batched = []
+                self._send_one(operation)
+
+        if batched:
+            self._send_batch(batched)
+
+        if not self._options['sequential']:
+            for operation in pending:
+                if not self._is_batchable(operation['uri']):
+                    self._send_one(operation)
+
+    def cancel(self):
+        """
+        Cancel the recorded operations which are not sent
+        :return:
+        """
+        pending, self._pending = self._pending, []
+        for operation in pending:
+            operation['future'].cancel()
+
+    def _create(self, parent, rel, resource, params=None):
+        """
+        Record creating resource by POST resource representation
+        :param parent: the parent resource
+        :param rel: link relation
+        :param resource: the resource representation
+        :param params: URL parameters
+        :return: future of created resource
+        """
+        link = parent.find_link(rel)
+        if link is None:
+            raise Exception('Parent resource does not have link relation %s.' % rel.rel)
+        return self._record('POST', link, entity=resource.representation(), params=params,
+                            on_result=self._client._cache_object)
+
+    def _record(self, method, link, entity=None, params=None, on_result=None):
+        """
+        Record an operation
+        :param method: HTTP method
+        :param link: the link
+        :param entity: request body
+        :param params: URL parameters
+        :param on_result: callable to post-process the resource of the response
+        :return: future of the result
+        """
+        if self._closed:
+            raise ValueError('The batch is already sent.')
+
+        uri = link.href
+        if params:
+            uri = '%s%s%s' % (uri, '&' if '?' in uri else '?', urlencode(params))
+
+        future = Future()
+        self._pending.append({'id': str(len(self._pending)), 'method': method, 'uri': uri, 'entity': entity,
+                              'on_result': on_result, 'future': future})
+        if len(self._pending) >= self._size:
+            self.flush()
+        return future
+
+    def _is_batchable(self, uri):
+        """
+        Check if the resource of the URI can be batched according to the batch capabilities
+        :param uri: the URI
+        :return:
+        """
+        name = _get_resource_name(uri)
+        if name in self._non_batchable:
+            return False
+        return not self._batchable or name in self._batchable
+
+    def _send_batch(self, operations):
+        """
+        Send operations in one batch and resolve their futures
+        :param operations: the operations
+        :return:
+        """
+        batch = ResourceUtility.generate_batch_request(*[_to_batch_operation(operation) for operation in operations],
+                                                       **self._options)
+        try:
+            results = self._client.create_batch(batch).get('operations') or []
+        except Exception as e:
+            for operation in operations:
+                operation['future'].set_exception(e)
+            return
+
+        responses = dict((result.get('id'), result.get('response') or {}) for result in results)
+        for operation in operations:
+            response = responses.get(operation['id'])
+            if response is None:
+                operation['future'].set_exception(Exception('Operation %s is not run in the batch.' % operation['id']))
+                continue
+
+            status = int(response.get('status', 0))
+            entity = response.get('entity')
+            if not 200 <= status < 300:
+                operation['future'].set_exception(Exception(entity))
+                continue
+
+            if entity and not isinstance(entity, dict):
+                entity = json.loads(entity)
+            self._resolve(operation, RestResource.Resource(entity) if entity else None)
+
+    def _send_one(self, operation):
+        """
+        Send an operation by its own request and resolve its future
+        :param operation: the operation
+        :return:
+        """
+        link = RestLink.Link(RestLink.REL_SELF.rel, operation['uri'])
+        try:
+            if operation['method'] == 'GET':
+                response = self._client._link_get(link)
+            elif operation['method'] == 'POST':
+                response = self._client._link_post(link, operation['entity'])
+            else:
+                response = self._client._link_delete(link)
+        except Exception as e:
+            operation['future'].set_exception(e)
+            return
+
+        self._resolve(operation, response.resource() if operation['method'] != 'DELETE' else None)
+
+    @staticmethod
+    def _resolve(operation, resource):
+        """
+        Post-process the resource of an operation and resolve its future
+        :param operation: the operation
+        :param resource: the resource of the response; None if there is no response body
+        :return:
+        """
+        try:
+            if operation['on_result'] is not None:
+                resource = operation['on_result'](resource)
+            operation['future'].set_result(resource)
+        except Exception as e:
+            operation['future'].set_exception(e)
+
+
+def _to_batch_operation(operation):
+    """
+    Convert a recorded operation to batch operation
+    :param operation: the recorded operation
+    :return: batch operation
+    """
+    headers = {'Accept': MEDIA_TYPE_DM_JSON}
+    if operation['entity'] is not None:
+        headers['Content-Type'] = MEDIA_TYPE_DM_JSON
+    return ResourceUtility.generate_batch_operation(operation['id'], '%s %s' % (operation['method'], operation['uri']),
+                                                    operation['uri'], operation['method'], operation['entity'],
+                                                    **headers)
+
+
+def _get_resource_name(uri):
+    """
+    Get the name of the resource of a URI as in batch capabilities, e.g. folders for .../folders/{id}/folders
+    and object for .../objects/{id}
+    :param uri: the URI
+    :return: resource name
+    """
+    segments = [segment for segment in urlsplit(uri).path.split('/') if segment]
+    if len(segments) > 1 and _OBJECT_ID.match(segments[-1]):
+        return segments[-2][:-1] if segments[-2].endswith('s') else segments[-2]
+    return segments[-1] if segments else ''
+
+
+def _is_supported(capability):
+    """
+    Check if a batch capability is supported, whose value is like all or none
+    :param capability: value of the capability
+    :return:
+    """
+    return bool(capability) and str(capability).lower() not in ('none', 'false', 'unsupported')
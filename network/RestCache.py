@@ -0,0 +1,539 @@
+"""
+This is a module for caches of REST resources.
+"""
+
+import collections
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from model import RestLink
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+DEFAULT_DISCOVERY_TTL = 3600
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_METADATA_TTL = 600
+DEFAULT_DISK_CACHE_BYTES = 256 * 1024 * 1024
+DEFAULT_ACCESS_RESOLUTION = 60
+DEFAULT_ACCESS_BATCH_SIZE = 100
+
+CacheStats = collections.namedtuple('CacheStats', ['hits', 'misses', 'size'])
+
+_clock = getattr(time, 'monotonic', time.time)
+
+
+class DiscoveryCache(object):
+    """
+    This class caches the raw home document and repository resources discovered when a REST client starts.
+    Entries expire after the TTL, and are fetched again by the client on next use. When a file path is given,
+    the cache is loaded from the file and saved to it on every change, so that it is reused by later processes.
+    """
+
+    def __init__(self, ttl=DEFAULT_DISCOVERY_TTL, path=None):
+        """
+        Initialize discovery cache
+        :param ttl: seconds for an entry to stay valid
+        :param path: path of the JSON file to persist the cache to; the cache is in memory only if None
+        """
+        self._ttl = ttl
+        self._path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+        if path:
+            self._load()
+
+    def get(self, key):
+        """
+        Get a cached raw resource
+        :param key: cache key
+        :return: raw resource; None if it is not cached or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry['time'] > self._ttl:
+                logger.debug('    [Discovery cache entry %s expired]', key)
+                return None
+            return entry['resource']
+
+    def put(self, key, raw_resource):
+        """
+        Cache a raw resource
+        :param key: cache key
+        :param raw_resource: raw resource
+        :return:
+        """
+        with self._lock:
+            self._entries[key] = {'time': time.time(), 'resource': raw_resource}
+            self._save()
+
+    def invalidate(self, key=None):
+        """
+        Remove a cached raw resource
+        :param key: cache key; all entries are removed if None
+        :return:
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            self._save()
+
+    def _load(self):
+        """
+        Load the cache from the file
+        :return:
+        """
+        try:
+            with open(self._path) as f:
+                self._entries = json.load(f)
+        except (IOError, OSError, ValueError) as e:
+            logger.debug('    [Discovery cache is not loaded from %s: %s]', self._path, e)
+            self._entries = {}
+
+    def _save(self):
+        """
+        Save the cache to the file. It is written to a temporary file first, so that concurrent processes
+        never read a partial file.
+        :return:
+        """
+        if not self._path:
+            return
+
+        temp_path = '%s.%d.tmp' % (self._path, os.getpid())
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(self._entries, f)
+            _replace(temp_path, self._path)
+        except (IOError, OSError) as e:
+            logger.warning('Discovery cache is not saved to %s: %s', self._path, e)
+
+
+class LruCache(object):
+    """
+    This class is a thread-safe in-process cache, which evicts the least recently used entry when it is full.
+    Entries expire after the TTL.
+    """
+
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE, ttl=DEFAULT_METADATA_TTL):
+        """
+        Initialize LRU cache
+        :param max_size: maximum number of entries
+        :param ttl: seconds for an entry to stay valid; entries never expire if None
+        """
+        self._max_size = max_size
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key):
+        """
+        Get a cached value
+        :param key: cache key
+        :return: cached value; None if it is not cached or expired
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None or (self._ttl is not None and _clock() - entry[0] > self._ttl):
+                self._misses += 1
+                return None
+
+            # re-insert as the most recently used entry
+            self._entries[key] = entry
+            self._hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        """
+        Cache a value
+        :param key: cache key
+        :param value: the value
+        :return:
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (_clock(), value)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key=None):
+        """
+        Remove a cached value
+        :param key: cache key; all entries are removed if None
+        :return:
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        """
+        Get statistics of the cache
+        :return: CacheStats with number of hits, misses and entries
+        """
+        with self._lock:
+            return CacheStats(self._hits, self._misses, len(self._entries))
+
+
+class PathIndex(LruCache):
+    """
+    This class is an LRU cache from repository paths to the r_object_id of the objects at the paths. Removing
+    a path removes the paths under it as well, as they change when a folder is renamed, moved or deleted.
+    """
+
+    def invalidate_path(self, path):
+        """
+        Remove a path and the paths under it
+        :param path: repository path
+        :return:
+        """
+        prefix = path.rstrip('/') + '/'
+        with self._lock:
+            for key in [key for key in self._entries if key == path or key.startswith(prefix)]:
+                del self._entries[key]
+
+    def invalidate_object(self, object_id):
+        """
+        Remove the paths of an object and the paths under them
+        :param object_id: r_object_id of the object
+        :return:
+        """
+        with self._lock:
+            paths = [key for key, entry in self._entries.items() if entry[1] == object_id]
+        for path in paths:
+            self.invalidate_path(path)
+
+
+class ObjectCache(object):
+    """
+    This class is an identity map of objects keyed by r_object_id and by the hrefs of their self and edit links,
+    so that an object is fetched once and then shared. RestClient updates or invalidates the cached object on its
+    own writes. Objects are looked up by id or href only; lookups by name are not served from the cache.
+    """
+
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE, ttl=DEFAULT_METADATA_TTL):
+        """
+        Initialize object cache
+        :param max_size: maximum number of cached objects
+        :param ttl: seconds for an object to stay valid, which bounds staleness after writes by other clients;
+                    objects never expire if None
+        """
+        # each object is cached by its id and up to two hrefs
+        self._cache = LruCache(max_size * 3, ttl)
+
+    def get_by_id(self, object_id):
+        """
+        Get cached object by its r_object_id
+        :param object_id: r_object_id of the object
+        :return: cached object; None if it is not cached
+        """
+        return self._cache.get(('id', object_id))
+
+    def get_by_href(self, href):
+        """
+        Get cached object by the href of its self or edit link
+        :param href: the href
+        :return: cached object; None if it is not cached
+        """
+        return self._cache.get(('href', href))
+
+    def put(self, resource):
+        """
+        Cache an object. Resources without r_object_id or links, e.g. collections, are not cached.
+        :param resource: the object
+        :return:
+        """
+        keys = self._get_keys(resource)
+        if len(keys) > 1 and keys[0][0] == 'id':
+            for key in keys:
+                self._cache.put(key, resource)
+
+    def invalidate(self, resource=None):
+        """
+        Remove a cached object
+        :param resource: the object; all objects are removed if None
+        :return:
+        """
+        if resource is None:
+            self._cache.invalidate()
+            return
+
+        for key in self._get_keys(resource):
+            self._cache.invalidate(key)
+
+    def invalidate_id(self, object_id):
+        """
+        Remove a cached object by its r_object_id
+        :param object_id: r_object_id of the object
+        :return:
+        """
+        resource = self._cache.get(('id', object_id))
+        if resource is not None:
+            self.invalidate(resource)
+
+    def stats(self):
+        """
+        Get statistics of the cache
+        :return: CacheStats with number of hits, misses and cache keys
+        """
+        return self._cache.stats()
+
+    @staticmethod
+    def _get_keys(resource):
+        """
+        Get cache keys of an object, which are its r_object_id and the hrefs of its self and edit links
+        :param resource: the object
+        :return: list of keys
+        """
+        keys = []
+        properties = resource.get('properties')
+        if isinstance(properties, dict) and properties.get('r_object_id'):
+            keys.append(('id', properties.get('r_object_id')))
+        for rel in (RestLink.REL_SELF, RestLink.REL_EDIT):
+            link = resource.find_link(rel)
+            if link is not None and ('href', link.href) not in keys:
+                keys.append(('href', link.href))
+        return keys
+
+
+class SingleFlight(object):
+    """
+    This class runs one call at a time for a key. Callers arriving while the call for their key is in flight wait
+    for it and share its result or error, instead of running the same call again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._shared = 0
+
+    def do(self, key, func):
+        """
+        Run the call for the key, or wait for the one in flight
+        :param key: key of the call
+        :param func: the call, which takes no argument
+        :return: result of the call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self._shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def shared_count(self):
+        """
+        Get the number of callers which shared the call of another caller
+        :return: number of shared calls
+        """
+        with self._lock:
+            return self._shared
+
+
+class _Call(object):
+    """This class is a call in flight of SingleFlight"""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SqliteCache(object):
+    """
+    This class is a disk-backed cache of HTTP responses stored in a SQLite database, which can be shared by
+    many threads and processes concurrently. The least recently used responses are evicted when the total size
+    of their bodies exceeds the limit. It can be used as HTTP cache of RestClient, so that responses downloaded
+    by one process are revalidated instead of downloaded again by the others.
+
+    Reads do not write to the database: access times are tracked coarsely, only when they are older than the
+    access resolution, and written in batches with the next put or once enough are pending, so that cache hits
+    do not contend for the write lock shared by all processes. The total size is kept in a meta row instead of
+    being summed over the table on every put.
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_DISK_CACHE_BYTES, timeout=30,
+                 access_resolution=DEFAULT_ACCESS_RESOLUTION):
+        """
+        Initialize SQLite cache
+        :param path: path of the SQLite database file
+        :param max_bytes: maximum total size of the cached response bodies
+        :param timeout: seconds to wait for the database lock held by other processes
+        :param access_resolution: seconds within which the access time of a response is not updated again
+        """
+        self._path = path
+        self._max_bytes = max_bytes
+        self._timeout = timeout
+        self._access_resolution = access_resolution
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._accessed = {}
+
+        connection = self._connection()
+        with connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, etag TEXT, '
+                               'last_modified TEXT, content BLOB, size INTEGER, accessed REAL)')
+            connection.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+            connection.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER)')
+            # the total of a database created before the meta table is summed once
+            connection.execute('INSERT OR IGNORE INTO meta VALUES (\'size\', '
+                               '(SELECT COALESCE(SUM(size), 0) FROM responses))')
+
+    def get(self, key):
+        """
+        Get a cached response
+        :param key: cache key
+        :return: cached response with etag, last_modified and content; None if it is not cached
+        """
+        row = self._connection().execute('SELECT etag, last_modified, content, accessed FROM responses WHERE key = ?',
+                                         (key,)).fetchone()
+
+        now = time.time()
+        with self._stats_lock:
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            if now - row[3] >= self._access_resolution:
+                self._accessed[key] = now
+            flush = len(self._accessed) >= DEFAULT_ACCESS_BATCH_SIZE
+
+        if flush:
+            connection = self._connection()
+            with connection:
+                self._flush_accessed(connection)
+
+        return {'etag': row[0], 'last_modified': row[1], 'content': bytes(row[2])}
+
+    def put(self, key, value):
+        """
+        Cache a response, and evict the least recently used responses if the cache is full
+        :param key: cache key
+        :param value: response with etag, last_modified and content
+        :return:
+        """
+        content = value['content']
+        if len(content) > self._max_bytes:
+            return
+
+        connection = self._connection()
+        with connection:
+            # the first statement writes, so the write lock is held before the total is read
+            connection.execute('UPDATE meta SET value = value + ? - COALESCE((SELECT size FROM responses '
+                               'WHERE key = ?), 0) WHERE name = \'size\'', (len(content), key))
+            connection.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+                               (key, value.get('etag'), value.get('last_modified'), sqlite3.Binary(content),
+                                len(content), time.time()))
+            self._flush_accessed(connection)
+
+            total = connection.execute('SELECT value FROM meta WHERE name = \'size\'').fetchone()[0]
+            if total <= self._max_bytes:
+                return
+            while total > self._max_bytes:
+                oldest = connection.execute('SELECT key, size FROM responses ORDER BY accessed LIMIT 100').fetchall()
+                if not oldest:
+                    total = 0
+                    break
+                for oldest_key, size in oldest:
+                    connection.execute('DELETE FROM responses WHERE key = ?', (oldest_key,))
+                    total -= size
+                    if total <= self._max_bytes:
+                        break
+            connection.execute('UPDATE meta SET value = ? WHERE name = \'size\'', (total,))
+
+    def invalidate(self, key=None):
+        """
+        Remove a cached response
+        :param key: cache key; all responses are removed if None
+        :return:
+        """
+        connection = self._connection()
+        with connection:
+            if key is None:
+                connection.execute('DELETE FROM responses')
+                connection.execute('UPDATE meta SET value = 0 WHERE name = \'size\'')
+            else:
+                connection.execute('UPDATE meta SET value = value - COALESCE((SELECT size FROM responses '
+                                   'WHERE key = ?), 0) WHERE name = \'size\'', (key,))
+                connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+
+    def stats(self):
+        """
+        Get statistics of the cache in this process
+        :return: CacheStats with number of hits, misses and entries
+        """
+        size = self._connection().execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        with self._stats_lock:
+            return CacheStats(self._hits, self._misses, size)
+
+    def _flush_accessed(self, connection):
+        """
+        Write the pending access times in the transaction of the connection
+        :param connection: database connection
+        :return:
+        """
+        with self._stats_lock:
+            accessed, self._accessed = self._accessed, {}
+        if accessed:
+            connection.executemany('UPDATE responses SET accessed = ? WHERE key = ? AND accessed < ?',
+                                   [(at, key, at) for key, at in accessed.items()])
+
+    def _connection(self):
+        """
+        Get the database connection of current thread, as SQLite connections can not be shared by threads
+        :return: database connection
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self._path, timeout=self._timeout)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+        return connection
+
+
+def _replace(src, dst):
+    """
+    Rename the file, replacing the destination if it exists
+    :param src: source path
+    :param dst: destination path
+    :return:
+    """
+    if hasattr(os, 'replace'):
+        os.replace(src, dst)
+    else:
+        if os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
@@ -1,8 +1,29 @@
+import collections
+import functools
+import json
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+try:
+    from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+except ImportError:
+    from urlparse import urlsplit, urlunsplit, parse_qsl
+    from urllib import urlencode
 
 from model import RestLink
 from model.RestLink import Link
 from model import RestResource
+from network import RestCache
+from network import RestRequest
+from network import RestSession
+from util import DqlUtility
+from util import ResourceUtility
 
 __author__ = 'wangc31'
 
@@ -13,33 +34,117 @@ logger.addHandler(logging.NullHandler())
 MEDIA_TYPE_DM_JSON = 'application/vnd.emc.documentum+json'
 MEDIA_TYPE_HOME_JSON = 'application/home+json'
 MEDIA_TYPE_OCTET_STREAM = 'application/octet-stream'
+MEDIA_TYPE_ANY = '*/*'
 
+DEFAULT_DQL_SHARDS = 8
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_DQL_IN_SIZE = 250
+DEFAULT_DELETE_PAGE_SIZE = 1000
 
-class RestClient:
-    """Client can consume Documentum REST services"""
+# objects of get_objects in the order of the requested ids, None for missing ones, and the missing ids
+ObjectsResult = collections.namedtuple('ObjectsResult', ['objects', 'missing'])
+
+# property which is filtered on by the server to get a resource of the collection by its title
+_TITLE_PROPERTIES = {
+    RestLink.REL_CABINETS.rel: 'object_name',
+    RestLink.REL_FOLDERS.rel: 'object_name',
+    RestLink.REL_DOCUMENTS.rel: 'object_name',
+    RestLink.REL_OBJECTS.rel: 'object_name',
+    RestLink.REL_SAVED_SEARCHES.rel: 'object_name',
+    RestLink.REL_SEARCH_TEMPLATES.rel: 'object_name',
+    RestLink.REL_USERS.rel: 'user_name',
+    RestLink.REL_GROUPS.rel: 'group_name',
+    RestLink.REL_FORMATS.rel: 'name',
+}
+
+# result of one item in a bulk operation; error is the exception raised for the item, or None on success
+BulkResult = collections.namedtuple('BulkResult', ['item', 'value', 'error'])
 
-    def __init__(self, user, pwd, rest_uri, repo):
+
+class RestClient:
+    """
+    Client can consume Documentum REST services.
+    A REST client is thread-safe, so one instance can be shared by many worker threads. Each operation builds
+    its own RestRequest, the pooled HTTP session is safe for concurrent use and the repository resource is
+    discovered only once. Size pool_maxsize to the number of worker threads to keep all their connections alive.
+    """
+
+    def __init__(self, user, pwd, rest_uri, repo, pool_connections=RestSession.DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=RestSession.DEFAULT_POOL_MAXSIZE, max_retries=RestSession.DEFAULT_MAX_RETRIES,
+                 warm_up=0, max_workers=None, lazy=False, discovery_cache=None, metadata_cache=None,
+                 http_cache=None, object_cache=None, path_index=None):
         """
         Initialize the essential info user name, user password and REST context URL.
-        Besides, the repository resource that the REST client is specific to is populated.
+        Besides, the repository resource that the REST client is specific to is populated, unless the client is lazy.
+        All requests of the REST client share one pooled keep-alive HTTP session.
         :param user: user name
         :param pwd: user password
         :param rest_uri: REST context URL
         :param repo: the repository resource of the REST client
+        :param pool_connections: number of hosts to keep connection pools for
+        :param pool_maxsize: maximum number of connections kept alive per host
+        :param max_retries: maximum number of retries for failed connections
+        :param warm_up: number of connections to open at construction
+        :param max_workers: default concurrency limit of bulk operations; pool_maxsize if None
+        :param lazy: whether to discover the repository resource on first use instead of at construction
+        :param discovery_cache: DiscoveryCache for the home document and repository resource, which can be persisted
+                                and shared by clients; an in-memory cache with default TTL if None
+        :param metadata_cache: cache for types, formats, relation types, network locations and aspects, which has
+                               methods get, put and invalidate like LruCache; an LruCache with default size and TTL
+                               if None
+        :param http_cache: cache for GET responses with ETag or Last-Modified, which are revalidated with conditional
+                           GET, and has methods get and put like LruCache; conditional GET is disabled if None
+        :param object_cache: ObjectCache of system objects, which is consulted when objects are fetched by link or
+                             id and kept coherent with the writes of this client; objects are always fetched if
+                             None. Lookups by name, e.g. get_document, always query the collection on the server,
+                             and only put the found object into the cache.
+        :param path_index: PathIndex from repository paths to object ids for get_by_path, which is kept coherent
+                           with the writes of this client; a PathIndex with default size and TTL if None
         """
         self._id = user
         self._pwd = pwd
         self._root_uri = rest_uri
         self._repo = repo
-        self._repo_resource = self.get_current_repository()
+        self._repo_resource = None
+        self._repo_lock = threading.Lock()
+        self._max_workers = max_workers or pool_maxsize
+        self._discovery_cache = discovery_cache if discovery_cache is not None else RestCache.DiscoveryCache()
+        self._metadata_cache = metadata_cache if metadata_cache is not None else RestCache.LruCache()
+        self._http_cache = http_cache
+        self._object_cache = object_cache
+        self._path_index = path_index if path_index is not None else RestCache.PathIndex()
+        self._single_flight = RestCache.SingleFlight()
+        self._session = RestSession.create_session(pool_connections, pool_maxsize, max_retries)
+        RestSession.warm_up(self._session, self._root_uri, min(warm_up, pool_maxsize))
+        if not lazy:
+            self.get_current_repository()
+
+    def close(self):
+        """
+        Close the pooled connections of the REST client
+        :return:
+        """
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def get_home_resource(self):
         """
-        Get home resource
+        Get home resource, which is cached in the discovery cache
         :return: home resource
         """
-        home_link = Link('home', self._root_uri)
-        return RestResource.Home(self._link_get(home_link, accept=MEDIA_TYPE_HOME_JSON).resource())
+        cache_key = 'home %s' % self._root_uri
+        raw_home = self._discovery_cache.get(cache_key)
+        if raw_home is None:
+            home_link = Link('home', self._root_uri)
+            raw_home = self._link_get(home_link, accept=MEDIA_TYPE_HOME_JSON).resource().raw_resource()
+            self._discovery_cache.put(cache_key, raw_home)
+
+        return RestResource.Home(RestResource.Resource(raw_home))
 
     def get_product_info(self):
         """
@@ -78,9 +183,7 @@ class RestClient:
         :param cabinet_name: cabinet name
         :return: cabinet resource
         """
-        filter_criteria = 'starts-with(object_name,\'' + cabinet_name + '\')'
-        cabinets = self.get_cabinets(params={'filter': filter_criteria})
-        return self._get_resource_via_entry(cabinets, 'title', cabinet_name)
+        return self._get_object(self.get_current_repository(), RestLink.REL_CABINETS, 'title', cabinet_name)
 
     def get_sysobjects(self, parent, params=None):
         """
@@ -100,6 +203,113 @@ class RestClient:
         """
         return self._get_object(parent, RestLink.REL_OBJECTS, 'title', object_name)
 
+    def get_by_path(self, path):
+        """
+        Get system object by its repository path, e.g. /Temp/folder/document. The object ids of resolved paths
+        are indexed, so an indexed path is resolved by GETs of the object and its parent folder instead of one
+        lookup per folder level, and any other path by one DQL query and one GET. An indexed object is returned
+        only if it is still at the path, as it may be moved or renamed by other clients.
+        :param path: repository path
+        :return: the system object; None if there is no object at the path
+        """
+        parent_path, object_name = DqlUtility.split_path(path)
+        path = '%s/%s' % (parent_path or '', object_name)
+
+        object_id = self._path_index.get(path)
+        if object_id is not None:
+            try:
+                obj = self.get_object_by_id(object_id)
+                if self._is_at_path(obj, parent_path, object_name):
+                    return obj
+            except Exception as e:
+                logger.debug('    [Indexed object %s of path %s is not found: %s]', object_id, path, e)
+            self._path_index.invalidate_path(path)
+
+        results = self.dql(DqlUtility.path_query(path), params={'items-per-page': 1}).get_entries()
+        if not results:
+            return None
+
+        object_id = results[0].get('content').get('properties').get('r_object_id')
+        self._path_index.put(path, object_id)
+        return self.get_object_by_id(object_id)
+
+    def _is_at_path(self, obj, parent_path, object_name):
+        """
+        Check if an object is at a repository path. A folder is checked by its folder paths, and any other object by
+        the ids of its parent folders, which contain the id of the folder at the parent path.
+        :param obj: the object
+        :param parent_path: path of the parent folder; None for cabinets
+        :param object_name: object name at the path
+        :return:
+        """
+        properties = obj.get('properties')
+        if properties.get('object_name') != object_name:
+            return False
+
+        if 'r_folder_path' in properties:
+            return '%s/%s' % (parent_path or '', object_name) in (properties.get('r_folder_path') or [])
+
+        if parent_path is None:
+            return False
+        parent = self.get_by_path(parent_path)
+        return parent is not None and parent.get('properties').get('r_object_id') in (
+            properties.get('i_folder_id') or [])
+
+    def get_object_by_id(self, object_id):
+        """
+        Get system object by its r_object_id
+        :param object_id: r_object_id of the object
+        :return: the system object
+        """
+        if self._object_cache is not None:
+            obj = self._object_cache.get_by_id(object_id)
+            if obj is not None:
+                return obj
+
+        return self._get_cached_object(Link(RestLink.REL_SELF.rel, self._get_object_href(object_id)))
+
+    def get_objects(self, object_ids, properties=None, max_workers=None):
+        """
+        Get many system objects by their r_object_id. Cached objects are served from the object cache, and the
+        others are fetched by the cheapest available way:
+        objects with the given properties only by DQL queries of r_object_id in (...) if properties are given;
+        else full objects by batches of GET operations if the repository supports batches;
+        else full objects by concurrent GETs.
+        Chunks of ids are fetched concurrently.
+        :param object_ids: r_object_id of the objects
+        :param properties: names of the properties to query by DQL; full objects are fetched if None
+        :param max_workers: concurrency limit
+        :return: ObjectsResult with the objects in the order of the ids, None for missing ones, and the ids of
+                 the objects which do not exist or are not accessible
+        """
+        object_ids = list(object_ids)
+        object_cache = self._object_cache if not properties else None
+        found = {}
+        remaining = []
+        for object_id in collections.OrderedDict.fromkeys(object_ids):
+            obj = object_cache.get_by_id(object_id) if object_cache is not None else None
+            if obj is not None:
+                found[object_id] = obj
+            else:
+                remaining.append(object_id)
+
+        if remaining:
+            if properties:
+                fetch, chunk_size = functools.partial(self._query_objects, properties=properties), DEFAULT_DQL_IN_SIZE
+            elif self.get_current_repository().find_link(RestLink.REL_BATCHES) is not None and len(remaining) > 1:
+                fetch, chunk_size = self._batch_get_objects, DEFAULT_BATCH_SIZE
+            else:
+                fetch, chunk_size = self._get_object_or_none, 1
+
+            chunks = [remaining[i:i + chunk_size] for i in range(0, len(remaining), chunk_size)]
+            for result in self.map(fetch, chunks, max_workers):
+                if result.error is not None:
+                    raise result.error
+                found.update(result.value)
+
+        return ObjectsResult([found.get(object_id) for object_id in object_ids],
+                             [object_id for object_id in object_ids if object_id not in found])
+
     def get_sharable_parent(self, lightweight_obj):
         """
         Get sharable parent
@@ -136,11 +346,11 @@ class RestClient:
 
     def get_type(self, type_name):
         """
-        Get type resource
+        Get type resource, which is cached in the metadata cache
         :param type_name: type name
         :return: type resource
         """
-        return self._get_object(self.get_current_repository(), RestLink.REL_TYPES, 'title', type_name)
+        return self._get_metadata(RestLink.REL_TYPES, type_name)
 
     def get_value_assistance(self, dm_type, assist_value_request, included_property=None):
         """
@@ -181,11 +391,11 @@ class RestClient:
 
     def get_format(self, format_name):
         """
-        Get format resource
+        Get format resource, which is cached in the metadata cache
         :param format_name: format name
         :return: format resource
         """
-        return self._get_object(self.get_current_repository(), RestLink.REL_FORMATS, 'title', format_name)
+        return self._get_metadata(RestLink.REL_FORMATS, format_name)
 
     def get_network_locations(self, params=None):
         """
@@ -197,12 +407,11 @@ class RestClient:
 
     def get_network_location(self, network_location_name):
         """
-        Get network location resource
+        Get network location resource, which is cached in the metadata cache
         :param network_location_name: network location name
         :return: network location resource
         """
-        return self._get_object(self.get_current_repository(), RestLink.REL_NETWORK_LOCATIONS, 'title',
-                                network_location_name)
+        return self._get_metadata(RestLink.REL_NETWORK_LOCATIONS, network_location_name)
 
     def get_relation_types(self, params=None):
         """
@@ -214,11 +423,11 @@ class RestClient:
 
     def get_relation_type(self, relation_type_name):
         """
-        Get relation type resource
+        Get relation type resource, which is cached in the metadata cache
         :param relation_type_name: relation type name
         :return: relation type resource
         """
-        return self._get_object(self.get_current_repository(), RestLink.REL_RELATION_TYPES, 'title', relation_type_name)
+        return self._get_metadata(RestLink.REL_RELATION_TYPES, relation_type_name)
 
     def get_users(self, parent, params=None):
         """
@@ -281,6 +490,26 @@ class RestClient:
         """
         return self._follow_resource_link(obj, RestLink.REL_CONTENTS, params=params)
 
+    def download_content(self, content, f, chunk_size=RestRequest.STREAM_CHUNK_SIZE):
+        """
+        Download the media of a content resource, e.g. from get_primary_content or get_contents, into a file.
+        The media is streamed, so it is never held in memory as a whole.
+        :param content: the content resource
+        :param f: file object opened in binary mode
+        :param chunk_size: number of bytes read at a time
+        :return: number of bytes downloaded
+        """
+        response = self._link_get(content.find_link(RestLink.REL_ENCLOSURE), accept=MEDIA_TYPE_ANY,
+                                  stream=True).response
+        size = 0
+        try:
+            for chunk in response.iter_content(chunk_size):
+                f.write(chunk)
+                size += len(chunk)
+        finally:
+            response.close()
+        return size
+
     def get_aspects(self, params=None):
         """
         Get aspects resource
@@ -291,11 +520,11 @@ class RestClient:
 
     def get_aspect(self, aspect_name):
         """
-        Get aspect resource
+        Get aspect resource, which is cached in the metadata cache
         :param aspect_name: aspect name
         :return: aspect resource
         """
-        return self._get_object(self.get_current_repository(), RestLink.REL_ASPECT_TYPES, aspect_name)
+        return self._get_metadata(RestLink.REL_ASPECT_TYPES, aspect_name)
 
     def get_batch_capabilities(self, params=None):
         """
@@ -305,6 +534,24 @@ class RestClient:
         """
         return self._get_objects(self.get_current_repository(), RestLink.REL_BATCH_CAPABILITIES, params=params)
 
+    def batch(self, size=DEFAULT_BATCH_SIZE, transactional=False, sequential=False, on_error='CONTINUE'):
+        """
+        Record calls as batch operations in a with block, so that many calls are sent in few requests:
+
+        with client.batch() as batch:
+            future = batch.create_folder(cabinet, new_folder)
+        folder = future.result()
+
+        :param size: maximum number of operations in one batch
+        :param transactional: whether operations of a batch are committed or rolled back together
+        :param sequential: whether operations of a batch are executed in order
+        :param on_error: CONTINUE to run the remaining operations of a batch when one fails; FAIL to stop
+        :return: Batch recorder
+        """
+        from network.RestBatch import Batch
+
+        return Batch(self, size, transactional, sequential, on_error)
+
     def create_batch(self, batch):
         return self._link_post(self.get_current_repository().find_link(RestLink.REL_BATCHES),
                                batch.representation()).resource()
@@ -315,8 +562,9 @@ class RestClient:
         :param cabinet: cabinet resource to create
         :return: created cabinet resource
         """
-        return self._create_object_by_representation(self.get_current_repository(), RestLink.REL_CABINETS,
-                                                     cabinet).resource()
+        response = self._create_object_by_representation(self.get_current_repository(), RestLink.REL_CABINETS,
+                                                         cabinet)
+        return self._cache_object(response.resource())
 
     def create_folder(self, parent, new_folder):
         """
@@ -325,7 +573,8 @@ class RestClient:
         :param new_folder: folder resource to create
         :return: created folder resource
         """
-        return self._create_object_by_representation(parent, RestLink.REL_FOLDERS, new_folder).resource()
+        return self._cache_object(
+            self._create_object_by_representation(parent, RestLink.REL_FOLDERS, new_folder).resource())
 
     def create_sysobj(self, parent, new_sysobj, rel=None, content=None, params=None):
         """
@@ -339,11 +588,12 @@ class RestClient:
         :return: created system object resource
         """
         if rel is None:
-            return self._create_object_by_representation(parent, RestLink.REL_OBJECTS, new_sysobj, content,
-                                                         params=params).resource()
+            response = self._create_object_by_representation(parent, RestLink.REL_OBJECTS, new_sysobj, content,
+                                                             params=params)
         else:
-            return self._create_object_by_representation(parent, rel,
-                                                         new_sysobj, params=params).resource()
+            response = self._create_object_by_representation(parent, rel,
+                                                             new_sysobj, params=params)
+        return self._cache_object(response.resource())
 
     def create_document(self, parent, new_doc, content=None, params=None):
         """
@@ -354,8 +604,9 @@ class RestClient:
         :param params: URL parameters
         :return: created document resource
         """
-        return self._create_object_by_representation(parent, RestLink.REL_DOCUMENTS, resource=new_doc, content=content,
-                                                     params=params).resource()
+        response = self._create_object_by_representation(parent, RestLink.REL_DOCUMENTS, resource=new_doc,
+                                                         content=content, params=params)
+        return self._cache_object(response.resource())
 
     def create_user(self, new_user):
         """
@@ -429,8 +680,10 @@ class RestClient:
         :param params: URL parameters
         :return:
         """
-        return self._link_post(obj.find_link(RestLink.REL_CONTENTS), data=content, accept=MEDIA_TYPE_DM_JSON,
-                               content_type=content_type, params=params).resource()
+        response = self._link_post(obj.find_link(RestLink.REL_CONTENTS), data=content, accept=MEDIA_TYPE_DM_JSON,
+                                   content_type=content_type, params=params)
+        self._evict_object(obj)
+        return response.resource()
 
     def check_out(self, obj):
         """
@@ -438,7 +691,9 @@ class RestClient:
         :param obj: the system out to check out
         :return:
         """
-        return self._link_put(obj.find_link(RestLink.REL_CHECK_OUT), data=None).resource()
+        checked_out = self._link_put(obj.find_link(RestLink.REL_CHECK_OUT), data=None).resource()
+        self._evict_object(obj)
+        return self._cache_object(checked_out)
 
     def cancel_check_out(self, obj):
         """
@@ -447,6 +702,7 @@ class RestClient:
         :return:
         """
         self._link_delete(obj.find_link(RestLink.REL_CANCEL_CHECK_OUT))
+        self._evict_object(obj)
 
     def check_in_minor(self, obj, new_obj, content=None, params=None):
         """
@@ -457,7 +713,7 @@ class RestClient:
         :param params: URL parameters
         :return:
         """
-        return self._check_in(obj, RestLink.REL_CHECK_IN_MINOR, new_obj, content, params).resource()
+        return self._check_in(obj, RestLink.REL_CHECK_IN_MINOR, new_obj, content, params)
 
     def check_in_major(self, obj, new_obj, content=None, params=None):
         """
@@ -468,7 +724,7 @@ class RestClient:
         :param params: URL parameters
         :return:
         """
-        return self._check_in(obj, RestLink.REL_CHECK_IN_MAJOR, new_obj, content, params).resource()
+        return self._check_in(obj, RestLink.REL_CHECK_IN_MAJOR, new_obj, content, params)
 
     def check_in_branch(self, obj, new_obj, content=None, params=None):
         """
@@ -479,7 +735,7 @@ class RestClient:
         :param params: URL paramters
         :return:
         """
-        return self._check_in(obj, RestLink.REL_CHECK_IN_BRANCH, new_obj, content, params).resource()
+        return self._check_in(obj, RestLink.REL_CHECK_IN_BRANCH, new_obj, content, params)
 
     def dql(self, dql, params=None):
         """
@@ -488,13 +744,64 @@ class RestClient:
         :param params: URL parameters
         :return: query results
         """
-        if params:
-            params['dql'] = dql
-        else:
-            params = {'dql': dql}
+        params = dict(params or {}, dql=dql)
 
         return self._link_get(self.get_current_repository().find_link(RestLink.REL_DQL), params=params).resource()
 
+    def dql_keyset(self, dql, page_size=100, params=None):
+        """
+        Execute DQL with keyset pagination and iterate all its results. Instead of requesting page N, each page
+        is queried by ordering on r_object_id and seeking after the r_object_id of the last result, so that the
+        cost of each page stays constant for large result sets.
+        :param dql: DQL statement without order by or group by clause, nor select distinct
+        :param page_size: number of results in each page
+        :param params: URL parameters
+        :return: generator of query results
+        """
+        params = dict(params or {}, **{'items-per-page': page_size})
+        params.pop('page', None)
+        last_key = None
+        while True:
+            entries = self.dql(DqlUtility.keyset_query(dql, last_key, page_size), params).get_entries()
+            # a page may be shorter than page_size when the server caps items-per-page, so only an empty page
+            # tells that the results are exhausted
+            if not entries:
+                return
+
+            for entry in entries:
+                yield entry
+
+            last_key = entries[-1].get('content').get('properties').get(DqlUtility.KEYSET_KEY)
+
+    def dql_sharded(self, dql, shards=DEFAULT_DQL_SHARDS, page_size=100, params=None, max_workers=None):
+        """
+        Execute DQL split into disjoint shards concurrently and iterate the merged results of all shards.
+        Each shard is paged with keyset pagination like dql_keyset. Results are not in any particular order.
+        :param dql: DQL statement without order by or group by clause
+        :param shards: number of shards split by r_object_id, from 1 to 16; or list of conditions, one per shard,
+                       which must not overlap
+        :param page_size: number of results in each page
+        :param params: URL parameters
+        :param max_workers: maximum number of shards queried concurrently
+        :return: generator of query results
+        """
+        if isinstance(shards, int):
+            shards = DqlUtility.object_id_shards(shards)
+
+        return self._merge_concurrently([functools.partial(self.dql_keyset, DqlUtility.add_condition(dql, shard),
+                                                           page_size, params)
+                                         for shard in shards], max_workers)
+
+    def stream_dql(self, dql, params=None):
+        """
+        Execute DQL and iterate the results of the page, which are parsed one by one from the streamed response
+        :param dql: DQL statement
+        :param params: URL parameters
+        :return: generator of query results
+        """
+        return self.stream_entries(self.get_current_repository().find_link(RestLink.REL_DQL),
+                                   params=dict(params or {}, dql=dql))
+
     def simple_search(self, q, params=None):
         """
         Execute search via simple search language
@@ -502,10 +809,7 @@ class RestClient:
         :param params: URl parameter
         :return: query results
         """
-        if params:
-            params['q'] = q
-        else:
-            params = {'q': q}
+        params = dict(params or {}, q=q)
 
         return self._link_get(self.get_current_repository().find_link(RestLink.REL_SEARCH), params=params).resource()
 
@@ -623,7 +927,9 @@ class RestClient:
         :param lightweight_obj: the lightweight object to materialize
         :return:
         """
-        return self._link_put(lightweight_obj.find_link(RestLink.REL_MATERIALIZE)).resource()
+        materialized = self._link_put(lightweight_obj.find_link(RestLink.REL_MATERIALIZE)).resource()
+        self._evict_object(lightweight_obj)
+        return self._cache_object(materialized)
 
     def dematerialize(self, lightweight_obj):
         """
@@ -631,7 +937,9 @@ class RestClient:
         :param lightweight_obj: the lightweight object to dematerialize
         :return:
         """
-        return self._link_delete(lightweight_obj.find_link(RestLink.REL_DEMATERIALIZE))
+        response = self._link_delete(lightweight_obj.find_link(RestLink.REL_DEMATERIALIZE))
+        self._evict_object(lightweight_obj)
+        return response
 
     def reparent(self, lightweight_obj, new_parent):
         """
@@ -640,7 +948,10 @@ class RestClient:
         :param new_parent: the new parent
         :return:
         """
-        return self._create_object_by_reference(lightweight_obj, RestLink.REL_SHARED_PARENT, new_parent.reference())
+        response = self._create_object_by_reference(lightweight_obj, RestLink.REL_SHARED_PARENT,
+                                                    new_parent.reference())
+        self._evict_object(lightweight_obj)
+        return response
 
     def attach_aspects(self, obj, object_aspects):
         """
@@ -649,7 +960,9 @@ class RestClient:
         :param object_aspects: aspects to attach
         :return:
         """
-        return self._link_post(obj.find_link(RestLink.REL_OBJECT_ASPECTS), object_aspects.representation()).resource()
+        response = self._link_post(obj.find_link(RestLink.REL_OBJECT_ASPECTS), object_aspects.representation())
+        self._evict_object(obj)
+        return response.resource()
 
     def detach(self, obj, aspect):
         """
@@ -659,14 +972,16 @@ class RestClient:
         :return:
         """
         self._link_delete(obj.find_link(RestLink.REL_DELETE, aspect))
+        self._evict_object(obj)
 
     def refresh(self, obj):
         """
-        Refresh system object by getting it again
+        Refresh system object by getting it again, bypassing the object cache, e.g. to see changes made by others.
+        The refreshed object replaces the cached one.
         :param obj: the system object
         :return: refreshed system object
         """
-        return self._follow_resource_link(obj, RestLink.REL_SELF)
+        return self._cache_object(self._follow_resource_link(obj, RestLink.REL_SELF))
 
     def update(self, sys_obj, new_sys_object):
         """
@@ -675,7 +990,9 @@ class RestClient:
         :param new_sys_object: the new object
         :return: the updated object
         """
-        return self._link_post(sys_obj.find_link(RestLink.REL_EDIT), data=new_sys_object.representation()).resource()
+        updated = self._link_post(sys_obj.find_link(RestLink.REL_EDIT), data=new_sys_object.representation()).resource()
+        self._evict_object(sys_obj)
+        return self._cache_object(updated)
 
     def delete(self, obj, params=None):
         """
@@ -692,14 +1009,97 @@ class RestClient:
             raise Exception(
                 'Object %s is not deletable as there is no link detected for the delete operation.' % obj.get(
                     'properties').get('r_object_id'))
+        self._evict_object(obj)
 
     def follow_link(self, link):
         """
-        GET request for the link href
+        GET request for the link href. Objects are served from the object cache if cached.
         :param link: the link
         :return: response of GET request
         """
-        return self._link_get(link, accept=MEDIA_TYPE_DM_JSON).resource()
+        return self._get_cached_object(link)
+
+    def stream_entries(self, link, params=None):
+        """
+        GET the collection of the link href and iterate its entries, which are parsed one by one from the streamed
+        response. Memory is bounded by the size of an entry instead of the page, e.g. for pages with inline=true.
+        :param link: the link of the collection
+        :param params: URL parameters
+        :return: generator of entries
+        """
+        return self._link_get(link, params=params, stream=True).resources()
+
+    def map(self, func, items, max_workers=None):
+        """
+        Run an operation for each item concurrently on a bounded worker pool
+        :param func: the operation, which takes one item
+        :param items: the items
+        :param max_workers: concurrency limit; the default of the REST client if None
+        :return: list of BulkResult in the order of the items
+        """
+        items = list(items)
+        if not items:
+            return []
+
+        def _run(item):
+            try:
+                return BulkResult(item, func(item), None)
+            except Exception as e:
+                logger.debug('    [Bulk operation failed for %s: %s]', item, e)
+                return BulkResult(item, None, e)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers or self._max_workers, len(items))) as executor:
+            return list(executor.map(_run, items))
+
+    def follow_links(self, links, max_workers=None):
+        """
+        GET requests for many link hrefs concurrently
+        :param links: the links
+        :param max_workers: concurrency limit
+        :return: list of BulkResult with the resources, in the order of the links
+        """
+        return self.map(self.follow_link, links, max_workers)
+
+    def get_entry_resources(self, collection, max_workers=None):
+        """
+        GET the editable resources of all entries of a collection concurrently
+        :param collection: collection resource
+        :param max_workers: concurrency limit
+        :return: list of BulkResult with the resources, in the order of the entries
+        """
+        return self.follow_links([entry.find_link(RestLink.REL_EDIT) for entry in collection.get_entries()],
+                                 max_workers)
+
+    def get_entry_resource(self, entry):
+        """
+        Get the resource of a collection entry, which is the inline content of the entry if the collection is
+        requested with inline=true, or else the resource of its edit link
+        :param entry: the entry
+        :return: the resource
+        """
+        content = entry.get('content')
+        if isinstance(content, dict) and 'links' in content:
+            return self._cache_object(RestResource.Resource(content))
+        return self._get_cached_object(entry.find_link(RestLink.REL_EDIT))
+
+    def update_all(self, updates, max_workers=None):
+        """
+        Update many objects concurrently
+        :param updates: pairs of the original object and the new object
+        :param max_workers: concurrency limit
+        :return: list of BulkResult with the updated objects, in the order of the updates
+        """
+        return self.map(lambda update: self.update(*update), updates, max_workers)
+
+    def delete_all(self, objs, params=None, max_workers=None):
+        """
+        Delete many objects concurrently
+        :param objs: the objects to delete
+        :param params: URL parameters
+        :param max_workers: concurrency limit
+        :return: list of BulkResult in the order of the objects
+        """
+        return self.map(lambda obj: self.delete(obj, params), objs, max_workers)
 
     def previous_page(self, current_page):
         """
@@ -707,7 +1107,7 @@ class RestClient:
         :param current_page: current page
         :return: system objects in previous page
         """
-        return self._link_get(current_page.find_link(RestLink.REL_PREVIOUS)).resource()
+        return self._follow_resource_link(current_page, RestLink.REL_PREVIOUS)
 
     def next_page(self, current_page):
         """
@@ -715,7 +1115,7 @@ class RestClient:
         :param current_page: current page
         :return: system objects in next page
         """
-        return self._link_get(current_page.find_link(RestLink.REL_NEXT)).resource()
+        return self._follow_resource_link(current_page, RestLink.REL_NEXT)
 
     def first_page(self, current_page):
         """
@@ -723,7 +1123,7 @@ class RestClient:
         :param current_page: current page
         :return: system objects in first page
         """
-        return self._link_get(current_page.find_link(RestLink.REL_FIRST)).resource()
+        return self._follow_resource_link(current_page, RestLink.REL_FIRST)
 
     def last_page(self, current_page):
         """
@@ -731,37 +1131,265 @@ class RestClient:
         :param current_page: current page
         :return: system objects in last page
         """
-        return self._link_get(current_page.find_link(RestLink.REL_LAST)).resource()
+        return self._follow_resource_link(current_page, RestLink.REL_LAST)
 
-    def delete_folder_recursively(self, folder):
+    def iter_entries(self, page, prefetch=True):
         """
-        Delete folder and its members
+        Iterate the entries of a collection across all its pages by following the next links.
+        The next page is fetched in background while the entries of the current page are consumed.
+        :param page: the first page of the collection, e.g. results of dql, get_cabinets or execute_saved_search
+        :param prefetch: whether to fetch the next page in background
+        :return: generator of entries
+        """
+        if not prefetch:
+            while page is not None:
+                for entry in page.get_entries():
+                    yield entry
+                page = self.next_page(page)
+            return
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            while page is not None:
+                next_page = executor.submit(self.next_page, page)
+                for entry in page.get_entries():
+                    yield entry
+                page = next_page.result()
+        finally:
+            executor.shutdown(wait=False)
+
+    def iter_entries_parallel(self, page, max_workers=None):
+        """
+        Iterate the entries of a collection across all its pages in order, while the remaining pages are fetched
+        concurrently. The last page is discovered from the last link or the total of the first page, so request the
+        first page with URL parameter include-total=true. Pages are fetched sequentially if it is unknown.
+        :param page: the first page of the collection, e.g. results of dql or simple_search
+        :param max_workers: maximum number of pages fetched concurrently
+        :return: generator of entries
+        """
+        next_link = page.find_link(RestLink.REL_NEXT)
+        last_page_number = self._get_last_page_number(page)
+        if next_link is None or last_page_number is None:
+            for entry in self.iter_entries(page):
+                yield entry
+            return
+
+        first_page_number = _get_page_number(next_link.href)
+        page_links = collections.deque(Link(RestLink.REL_NEXT.rel, _set_page_number(next_link.href, number))
+                                       for number in range(first_page_number, last_page_number + 1))
+
+        max_workers = max_workers or self._max_workers
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            pending = collections.deque()
+            while page_links and len(pending) < max_workers:
+                pending.append(executor.submit(self.follow_link, page_links.popleft()))
+
+            for entry in page.get_entries():
+                yield entry
+
+            while pending:
+                page = pending.popleft().result()
+                if page_links:
+                    pending.append(executor.submit(self.follow_link, page_links.popleft()))
+                for entry in page.get_entries():
+                    yield entry
+        finally:
+            executor.shutdown(wait=False)
+
+    @staticmethod
+    def _get_last_page_number(page):
+        """
+        Get the number of the last page of a collection
+        :param page: a page of the collection
+        :return: the last page number; None if it is unknown
+        """
+        last_link = page.find_link(RestLink.REL_LAST)
+        if last_link is not None and _get_page_number(last_link.href) is not None:
+            return _get_page_number(last_link.href)
+
+        total = page.get('total')
+        items_per_page = page.get('items-per-page')
+        if total is not None and items_per_page:
+            return max(1, -(-int(total) // int(items_per_page)))
+
+        return None
+
+    def walk(self, folder, max_depth=None, folder_filter=None, params=None, max_workers=None):
+        """
+        Walk the folder tree like os.walk, and yield a tuple (folder, sub-folders, objects) for each folder in it.
+        Sub-folders and objects are listed inline across all their pages, and sibling sub-trees are listed
+        concurrently, so a folder is yielded before its sub-folders while siblings come in no particular order.
+        Like os.walk, sub-folders removed from the yielded list in place are not walked.
+        :param folder: the top folder
+        :param max_depth: depth of the deepest folders to walk, where the top folder is at depth 0; unlimited if None
+        :param folder_filter: callable which takes a sub-folder and returns whether to walk it; all if None
+        :param params: URL parameters to list the sub-folders and objects, e.g. items-per-page
+        :param max_workers: maximum number of folders listed concurrently
+        :return: generator of tuples (folder, sub-folders, objects)
+        """
+        max_workers = max_workers or self._max_workers
+        waiting = collections.deque([(folder, 0)])
+        running = set()
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            while waiting or running:
+                while waiting and len(running) < max_workers:
+                    running.add(executor.submit(self._list_folder, *waiting.popleft(), params=params))
+
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    parent, sub_folders, objects, depth = future.result()
+                    yield parent, sub_folders, objects
+
+                    if max_depth is None or depth < max_depth:
+                        waiting.extend((sub_folder, depth + 1) for sub_folder in sub_folders
+                                       if folder_filter is None or folder_filter(sub_folder))
+        finally:
+            executor.shutdown(wait=False)
+
+    def _list_folder(self, folder, depth, params=None):
+        """
+        List the sub-folders and objects of a folder inline across all their pages
+        :param folder: the folder
+        :param depth: depth of the folder in the walk
+        :param params: URL parameters
+        :return: tuple of the folder, its sub-folders, its objects and the depth
+        """
+        params = dict(params or {}, inline='true')
+        sub_folders = [self.get_entry_resource(entry)
+                       for entry in self.iter_entries(self.get_folders(folder, params=params), prefetch=False)]
+
+        sub_folder_ids = set(sub_folder.get('properties').get('r_object_id') for sub_folder in sub_folders)
+        objects = [obj for obj in (self.get_entry_resource(entry) for entry in
+                                   self.iter_entries(self.get_sysobjects(folder, params=params), prefetch=False))
+                   if obj.get('properties').get('r_object_id') not in sub_folder_ids]
+        return folder, sub_folders, objects, depth
+
+    def delete_folder_recursively(self, folder, all_versions=False, max_workers=None):
+        """
+        Delete folder and its members. Instead of walking the folder tree, the members are discovered by sharded DQL
+        queries on the folder path, and deleted concurrently by their ids without getting them first: the objects
+        first, and then the sub-folders in waves from the deepest level up.
         :param folder: the folder to delete
+        :param all_versions: whether to delete all versions of the objects, or else only their current versions
+        :param max_workers: concurrency limit
         :return:
         """
-        logger.info('Delete folder %s recursively.', folder.get('properties').get('object_name'))
         if not folder:
             return
+        logger.info('Delete folder %s recursively.', folder.get('properties').get('object_name'))
 
-        for sub_folder_entry in self.get_folders(folder).get_entries():
-            sub_folder = self.follow_link(sub_folder_entry.find_link(RestLink.REL_EDIT))
-            self.delete_folder_recursively(sub_folder)
-
-        for obj_entry in self.get_sysobjects(folder).get_entries():
-            obj = self.follow_link(obj_entry.find_link(RestLink.REL_EDIT))
-            self.delete(obj)
+        folder_paths = folder.get('properties').get('r_folder_path')
+        if not folder_paths:
+            folder = self.refresh(folder)
+            folder_paths = folder.get('properties').get('r_folder_path')
+        scope = 'folder(%s, descend)' % DqlUtility.quote(folder_paths[0])
+
+        # a sub-folder must be deleted before every folder it is linked into; its deepest path under the folder is
+        # deeper than the deepest path of each of its parents, as each parent path gives it a path one level deeper
+        sub_folder_depths = {}
+        for entry in self.dql_sharded('select r_object_id, r_folder_path from dm_folder where %s' % scope,
+                                      page_size=DEFAULT_DELETE_PAGE_SIZE, max_workers=max_workers):
+            properties = entry.get('content').get('properties')
+            paths = [path for path in properties.get('r_folder_path') or []
+                     if path.startswith(folder_paths[0] + '/')] or ['']
+            sub_folder_depths[properties.get('r_object_id')] = max(path.count('/') for path in paths)
+
+        object_ids = [entry.get('content').get('properties').get('r_object_id')
+                      for entry in self.dql_sharded('select r_object_id from dm_sysobject where %s' % scope,
+                                                    page_size=DEFAULT_DELETE_PAGE_SIZE, max_workers=max_workers)]
+        self._delete_by_ids([object_id for object_id in object_ids if object_id not in sub_folder_depths],
+                            {'del-version': 'all'} if all_versions else None, max_workers)
+
+        for depth in sorted(set(sub_folder_depths.values()), reverse=True):
+            self._delete_by_ids([object_id for object_id, folder_depth in sub_folder_depths.items()
+                                 if folder_depth == depth], None, max_workers)
 
         self.delete(folder)
 
+    def _delete_by_ids(self, object_ids, params=None, max_workers=None):
+        """
+        Delete objects by their ids concurrently
+        :param object_ids: r_object_id of the objects
+        :param params: URL parameters
+        :param max_workers: concurrency limit
+        :return:
+        """
+        logger.debug('    [Delete %d objects]', len(object_ids))
+
+        def _delete(object_id):
+            self._link_delete(Link(RestLink.REL_DELETE.rel, self._get_object_href(object_id)), params=params)
+            self._evict_object_id(object_id)
+
+        for result in self.map(_delete, object_ids, max_workers):
+            if result.error is not None:
+                raise result.error
+
+    def _merge_concurrently(self, producers, max_workers=None):
+        """
+        Run producers concurrently and iterate the merged items as they arrive. Producers stop once the iteration
+        is closed, and the first error of a producer is raised to the consumer.
+        :param producers: callables which return iterables
+        :param max_workers: maximum number of producers run concurrently
+        :return: generator of items
+        """
+        if not producers:
+            return
+
+        items = queue.Queue(maxsize=self._max_workers * 100)
+        stopped = threading.Event()
+        done = object()
+
+        def _put(item):
+            while not stopped.is_set():
+                try:
+                    items.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def _produce(producer):
+            try:
+                for item in producer():
+                    if not _put((item, None)):
+                        return
+                _put((done, None))
+            except Exception as e:
+                _put((done, e))
+
+        executor = ThreadPoolExecutor(max_workers=min(max_workers or self._max_workers, len(producers)))
+        try:
+            for producer in producers:
+                executor.submit(_produce, producer)
+
+            remaining = len(producers)
+            while remaining:
+                item, error = items.get()
+                if error is not None:
+                    raise error
+                if item is done:
+                    remaining -= 1
+                else:
+                    yield item
+        finally:
+            stopped.set()
+            executor.shutdown(wait=False)
+
     def _follow_resource_link(self, resource, rel, params=None):
         """
         GET the link href of a resource
         :param resource: the resource
         :param rel: the link relation for the target link
         :param params: URL parameters
-        :return: requested resource
+        :return: requested resource; None if the resource has no such link
         """
-        return self._link_get(resource.find_link(rel), params=params).resource()
+        link = resource.find_link(rel)
+        if link is None:
+            return None
+
+        return self._link_get(link, params=params).resource()
 
     def _get_objects(self, parent, rel, params=None):
         """
@@ -779,31 +1407,208 @@ class RestClient:
 
     def get_current_repository(self):
         """
-        Get repository resource specific to the REST client
+        Get repository resource specific to the REST client, which is discovered only once
         :return: repository resource
         """
-        if not hasattr(self, "_repo_resource") or not self._repo_resource:
-            repo = self.get_repository(self._repo)
-            if not repo:
-                raise Exception(
-                    "The specified repository %s does not exist. Input an existing repository to run the demo."
-                    % self._repo)
-            return repo
-        else:
-            return self._repo_resource
+        if self._repo_resource is None:
+            with self._repo_lock:
+                if self._repo_resource is None:
+                    cache_key = 'repository %s %s' % (self._root_uri, self._repo)
+                    raw_repo = self._discovery_cache.get(cache_key)
+                    if raw_repo is not None:
+                        self._repo_resource = RestResource.Resource(raw_repo)
+                        return self._repo_resource
+
+                    repo = self.get_repository(self._repo)
+                    if not repo:
+                        raise Exception(
+                            "The specified repository %s does not exist. Input an existing repository to run the demo."
+                            % self._repo)
+                    self._discovery_cache.put(cache_key, repo.raw_resource())
+                    self._repo_resource = repo
+        return self._repo_resource
+
+    def get_metadata_cache(self):
+        """
+        Get the cache for types, formats, relation types, network locations and aspects, e.g. to invalidate it
+        or to get its statistics
+        :return: metadata cache
+        """
+        return self._metadata_cache
+
+    def _get_metadata(self, rel, name):
+        """
+        Get repository metadata resource by its name through the metadata cache
+        :param rel: link relation of the metadata collection
+        :param name: name of the metadata resource
+        :return: metadata resource
+        """
+        cache_key = (rel.rel, name)
+        resource = self._metadata_cache.get(cache_key)
+        if resource is None:
+            resource = self._get_object(self.get_current_repository(), rel, 'title', name)
+            if resource is not None:
+                self._metadata_cache.put(cache_key, resource)
+        return resource
+
+    def get_path_index(self):
+        """
+        Get the path index of get_by_path, e.g. to invalidate paths changed by other clients
+        :return: path index
+        """
+        return self._path_index
+
+    def get_object_cache(self):
+        """
+        Get the object cache, e.g. to invalidate objects changed by other clients or to get its statistics
+        :return: object cache; None if objects are not cached
+        """
+        return self._object_cache
+
+    def _get_cached_object(self, link):
+        """
+        GET the resource of the link href through the object cache
+        :param link: the link
+        :return: the resource
+        """
+        if self._object_cache is not None and link is not None:
+            resource = self._object_cache.get_by_href(link.href)
+            if resource is not None:
+                return resource
+
+        return self._cache_object(self._link_get(link, accept=MEDIA_TYPE_DM_JSON).resource())
+
+    def _cache_object(self, resource):
+        """
+        Put the resource into the object cache if it is an object, and index the paths of folders
+        :param resource: the resource
+        :return: the resource
+        """
+        if resource is None:
+            return resource
+
+        if self._object_cache is not None:
+            self._object_cache.put(resource)
+
+        properties = resource.get('properties')
+        if isinstance(properties, dict) and properties.get('r_object_id'):
+            for path in properties.get('r_folder_path') or []:
+                self._path_index.put(path, properties.get('r_object_id'))
+        return resource
+
+    def _evict_object(self, resource):
+        """
+        Remove the object from the object cache and its paths from the path index after it is changed
+        :param resource: the object
+        :return:
+        """
+        if resource is None:
+            return
+
+        if self._object_cache is not None:
+            self._object_cache.invalidate(resource)
+
+        properties = resource.get('properties')
+        if isinstance(properties, dict) and properties.get('r_object_id'):
+            self._path_index.invalidate_object(properties.get('r_object_id'))
+            # paths under a folder may be indexed even if the folder itself is not
+            for path in properties.get('r_folder_path') or []:
+                self._path_index.invalidate_path(path)
+
+    def _query_objects(self, object_ids, properties):
+        """
+        Query the properties of objects by DQL
+        :param object_ids: r_object_id of the objects
+        :param properties: names of the properties
+        :return: dictionary from r_object_id to query result of the found objects
+        """
+        columns = ['r_object_id'] + [name for name in properties if name != 'r_object_id']
+        dql = 'select %s from dm_sysobject (all) where r_object_id in (%s)' % (
+            ', '.join(columns), ', '.join(DqlUtility.quote(object_id) for object_id in object_ids))
+
+        found = {}
+        for entry in self.iter_entries(self.dql(dql, params={'items-per-page': len(object_ids)}), prefetch=False):
+            content = entry.get('content')
+            found[content.get('properties').get('r_object_id')] = RestResource.Resource(content)
+        return found
+
+    def _batch_get_objects(self, object_ids):
+        """
+        Get objects by a batch of GET operations, which continues when objects are missing
+        :param object_ids: r_object_id of the objects
+        :return: dictionary from r_object_id to the found objects
+        """
+        operations = [ResourceUtility.generate_batch_operation(object_id, 'get object %s' % object_id,
+                                                               self._get_object_href(object_id), 'GET',
+                                                               Accept=MEDIA_TYPE_DM_JSON)
+                      for object_id in object_ids]
+        batch = ResourceUtility.generate_batch_request(*operations, **{'transactional': False, 'on-error': 'CONTINUE'})
+
+        found = {}
+        for operation in self.create_batch(batch).get('operations'):
+            response = operation.get('response') or {}
+            if int(response.get('status', 0)) != 200:
+                logger.debug('    [Object %s is not fetched in batch: %s]', operation.get('id'), response.get('status'))
+                continue
+
+            entity = response.get('entity')
+            if not isinstance(entity, dict):
+                entity = json.loads(entity)
+            found[operation.get('id')] = self._cache_object(RestResource.Resource(entity))
+        return found
+
+    def _get_object_or_none(self, object_ids):
+        """
+        Get objects by GETs, skipping the objects which can not be fetched
+        :param object_ids: r_object_id of the objects
+        :return: dictionary from r_object_id to the found objects
+        """
+        found = {}
+        for object_id in object_ids:
+            try:
+                found[object_id] = self.get_object_by_id(object_id)
+            except Exception as e:
+                logger.debug('    [Object %s is not fetched: %s]', object_id, e)
+        return found
+
+    def _evict_object_id(self, object_id):
+        """
+        Remove the object from the object cache and its paths from the path index by its id
+        :param object_id: r_object_id of the object
+        :return:
+        """
+        if self._object_cache is not None:
+            self._object_cache.invalidate_id(object_id)
+        self._path_index.invalidate_object(object_id)
+
+    def _get_object_href(self, object_id):
+        """
+        Get the href of an object, which is built from the href of the repository
+        :param object_id: r_object_id of the object
+        :return: href of the object
+        """
+        return '%s/objects/%s' % (self.get_current_repository().find_link(RestLink.REL_SELF).href, object_id)
 
     def _get_object(self, parent, rel, attr_name=None, attr_value=None):
         """
         Follow link of parent resource and get the resource based on attribute value.
         For example, parent is repository resource and link relation is http://identifiers.emc.com/linkrel/users,
         it will get users of the repository resource and return the one specified by attribute value.
+        When the resource is specified by title of a collection which supports it, entries are filtered by the
+        server and requested inline, so that the lookup is one small request. Other collections are searched
+        page by page without inline entries, and the resource of the matching entry is fetched by its edit link.
         :param parent: the parent resource
         :param rel: link relation
         :param attr_name: attribute name to specify object
         :param attr_value: attribute value to specify object
         :return: the object
         """
-        objects = self._get_objects(parent, rel)
+        params = None
+        title_property = _TITLE_PROPERTIES.get(rel.rel)
+        if attr_name == 'title' and title_property is not None:
+            params = {'filter': '%s=%s' % (title_property, DqlUtility.quote(attr_value)), 'inline': 'true'}
+
+        objects = self._get_objects(parent, rel, params=params)
         return self._get_resource_via_entry(objects, attr_name, attr_value)
 
     def _create_object_by_representation(self, parent, rel, resource, content=None, params=None):
@@ -840,18 +1645,19 @@ class RestClient:
         :param new_obj: new object
         :param content: the content
         :param params: URL parameters
-        :return:
+        :return: checked in object
         """
         if new_obj and content:
-            return self._link_post_multipart(obj.find_link(rel), meta=new_obj.representation(), content=content,
-                                             params=params)
+            response = self._link_post_multipart(obj.find_link(rel), meta=new_obj.representation(), content=content,
+                                                 params=params)
         elif not new_obj:
-            return self._link_post(obj.find_link(rel), data=content, content_type=MEDIA_TYPE_OCTET_STREAM,
-                                   params=params)
-        elif not content:
-            return self._link_post(obj.find_link(rel), data=new_obj.representation(), params=params)
+            response = self._link_post(obj.find_link(rel), data=content, content_type=MEDIA_TYPE_OCTET_STREAM,
+                                       params=params)
+        else:
+            response = self._link_post(obj.find_link(rel), data=new_obj.representation(), params=params)
 
-        return None
+        self._evict_object(obj)
+        return self._cache_object(response.resource())
 
     def _remove_member_from_group(self, group, rel, member_name):
         """
@@ -866,17 +1672,18 @@ class RestClient:
             if member_name == member_in_group.get('title'):
                 self.delete(member_in_group)
 
-    def _link_get(self, link, accept=MEDIA_TYPE_DM_JSON, params=None):
+    def _link_get(self, link, accept=MEDIA_TYPE_DM_JSON, params=None, stream=False):
         """
-        GET the link href
+        GET the link href. Concurrent GETs of the same href, media type and URL parameters share one request.
         :param link: the link
         :param accept: HTTP header accept
         :param params: URL parameters
+        :param stream: whether to stream the response body
         :return: HTTP response
         """
         if link is not None:
-            return link.request().auth(self._id, self._pwd).accept(
-                accept).get(params=params)
+            return link.request(self._session).auth(self._id, self._pwd).accept(
+                accept).stream(stream).cache(self._http_cache).coalesce(self._single_flight).get(params=params)
         else:
             return None
 
@@ -897,8 +1704,8 @@ class RestClient:
                 ('metadata', ('', meta, MEDIA_TYPE_DM_JSON)),
                 ('binary', ('', content, ''))
             ]
-            return link.request().auth(self._id, self._pwd).accept(accept).as_(content_type).post(files=multipart,
-                                                                                                  params=params)
+            request = link.request(self._session).auth(self._id, self._pwd).accept(accept).as_(content_type)
+            return request.post(files=multipart, params=params)
         else:
             return None
 
@@ -913,8 +1720,8 @@ class RestClient:
         :return: HTTP response
         """
         if link is not None:
-            return link.request().auth(self._id, self._pwd).accept(accept).as_(content_type).post(data=data,
-                                                                                                  params=params)
+            request = link.request(self._session).auth(self._id, self._pwd).accept(accept).as_(content_type)
+            return request.post(data=data, params=params)
         else:
             return None
 
@@ -929,8 +1736,8 @@ class RestClient:
         :return: HTTP response
         """
         if link is not None:
-            return link.request().auth(self._id, self._pwd).accept(accept).as_(content_type).put(data=data,
-                                                                                                 params=params)
+            request = link.request(self._session).auth(self._id, self._pwd).accept(accept).as_(content_type)
+            return request.put(data=data, params=params)
         else:
             return None
 
@@ -942,24 +1749,49 @@ class RestClient:
         :return: HTTP response
         """
         if link is not None:
-            return link.request().auth(self._id, self._pwd).delete(params=params)
+            return link.request(self._session).auth(self._id, self._pwd).delete(params=params)
         else:
             return None
 
     def _get_resource_via_entry(self, collection, attr_name, attr_value):
         """
-        GET one resource from collection by filtering with attribute
+        GET one resource from collection by filtering with attribute. All pages of the collection are searched.
         :param collection: collection resource
         :param attr_name: attribute name to filter
         :param attr_value: attribute value to fileter
         :return:
         """
-        for resource_entry in collection.get_entries():
+        for resource_entry in self.iter_entries(collection, prefetch=False):
             if attr_value == resource_entry.get(attr_name):
-                return self._link_get(resource_entry.find_link(RestLink.REL_EDIT)).resource()
+                return self.get_entry_resource(resource_entry)
         return None
 
 
+def _get_page_number(href):
+    """
+    Get the page number in URL parameters of a collection href
+    :param href: the collection href
+    :return: page number; None if there is no page number
+    """
+    for key, value in parse_qsl(urlsplit(href).query):
+        if key == 'page':
+            return int(value)
+    return None
+
+
+def _set_page_number(href, page_number):
+    """
+    Set the page number in URL parameters of a collection href
+    :param href: the collection href
+    :param page_number: the page number
+    :return: the href of the page
+    """
+    parts = urlsplit(href)
+    params = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != 'page']
+    params.append(('page', str(page_number)))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(params), parts.fragment))
+
+
 def main():
     return
 
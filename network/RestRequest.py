@@ -1,8 +1,15 @@
 from model import RestResource
+from util import JsonStream
 import requests
 import base64
+import json
 import logging
 
+try:
+    from urllib.parse import urlencode
+except ImportError:
+    from urllib import urlencode
+
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
@@ -12,20 +19,29 @@ HTTP_VERBS = ['delete', 'get', 'head', 'options', 'patch', 'post', 'put',
 HTTP_STATUS_OK = 200
 HTTP_STATUS_CREATED = 201
 HTTP_STATUS_NO_CONTENT = 204
+HTTP_STATUS_NOT_MODIFIED = 304
 
 HTTP_HEADER_ACCEPT = 'accept'
 HTTP_HEADER_CONTENT_TYPE = 'content-type'
+HTTP_HEADER_ETAG = 'etag'
+HTTP_HEADER_LAST_MODIFIED = 'last-modified'
+HTTP_HEADER_IF_NONE_MATCH = 'if-none-match'
+HTTP_HEADER_IF_MODIFIED_SINCE = 'if-modified-since'
+
+STREAM_CHUNK_SIZE = 64 * 1024
 
 
 class RestRequest:
     """The class is the request to Documentum REST services"""
 
-    def __init__(self, href):
+    def __init__(self, href, session=None):
         """
         Initialize REST request
         :param href: the request href
+        :param session: the pooled HTTP session to send the request with; a new connection is used if None
         """
         self.href = href
+        self.session = session
         self.verb = None
         self.user = None
         self.pwd = None
@@ -36,6 +52,9 @@ class RestRequest:
 
         self.accept_type = None
         self.content_type = None
+        self.is_stream = False
+        self.http_cache = None
+        self.single_flight = None
 
     def __call__(self, data=None, files=None, params=None):
         """
@@ -79,6 +98,35 @@ class RestRequest:
         self.content_type = media_type
         return self
 
+    def stream(self, enabled=True):
+        """
+        Stream the response body instead of reading it at once
+        :param enabled: whether to stream the response body
+        :return: RestRequest instance
+        """
+        self.is_stream = enabled
+        return self
+
+    def cache(self, http_cache):
+        """
+        Revalidate GET response with the cached one. The ETag and Last-Modified of the response are stored in the
+        cache, and sent back as If-None-Match and If-Modified-Since; a 304 response is served from the cache.
+        :param http_cache: cache which has methods get and put like RestCache.LruCache; None to disable
+        :return: RestRequest instance
+        """
+        self.http_cache = http_cache
+        return self
+
+    def coalesce(self, single_flight):
+        """
+        Share one in-flight GET among concurrent identical requests, which are sent with the same media type,
+        href and URL parameters; all of them receive the same response. Streamed requests are never coalesced.
+        :param single_flight: RestCache.SingleFlight shared by the requests; None to disable
+        :return: RestRequest instance
+        """
+        self.single_flight = single_flight
+        return self
+
     def __getattr__(self, name):
         """
         Populate callable method name if it is HTTP method
@@ -110,17 +158,86 @@ class RestRequest:
         Run request
         :return:
         """
+        if self.single_flight is not None and self.verb == 'get' and not self.is_stream:
+            return self.single_flight.do(self.cache_key(), self._send)
+        return self._send()
+
+    def _send(self):
+        """
+        Send request and check its response
+        :return: REST response
+        """
         logger.debug('    [%s <--> URI %s]' % (self.verb.upper(), self.href))
         headers = self.prepare_headers()
+        sender = self.session if self.session is not None else requests
+
+        cached = None
+        if self._is_cacheable():
+            cached = self.http_cache.get(self.cache_key())
+            if cached is not None:
+                headers.update(self._get_conditional_headers(cached))
 
         if self._is_multipart_request():
-            rsp = requests.request(self.verb, self.href, headers=headers, params=self.params, files=self.files)
+            rsp = sender.request(self.verb, self.href, headers=headers, params=self.params, files=self.files,
+                                 stream=self.is_stream)
         else:
-            rsp = requests.request(self.verb, self.href, headers=headers, params=self.params, data=self.data)
+            rsp = sender.request(self.verb, self.href, headers=headers, params=self.params, data=self.data,
+                                 stream=self.is_stream)
+
+        if cached is not None and rsp.status_code == HTTP_STATUS_NOT_MODIFIED:
+            logger.debug('    [Not modified, use cached response]')
+            rsp = BufferedResponse(HTTP_STATUS_OK, rsp.headers, cached['content'])
 
         self.check_return_code(rsp)
+
+        if self._is_cacheable() and rsp.status_code == HTTP_STATUS_OK:
+            self._cache_response(rsp)
+
         return RestResponse(rsp)
 
+    def cache_key(self):
+        """
+        Get the key of the request in HTTP cache, which consists of user, media type, href and URL parameters.
+        The user is in the key as links and properties of a resource depend on the permissions of the user,
+        so a response cached for one user must not be revalidated for another one sharing the cache.
+        :return: cache key
+        """
+        params = sorted((k, str(v)) for k, v in (self.params or {}).items() if v is not None)
+        return '%s %s %s?%s' % (self.user, self.accept_type, self.href, urlencode(params))
+
+    def _is_cacheable(self):
+        """
+        Check if the request is revalidated with HTTP cache
+        :return:
+        """
+        return self.http_cache is not None and self.verb == 'get' and not self.is_stream
+
+    @staticmethod
+    def _get_conditional_headers(cached):
+        """
+        Get HTTP headers for conditional GET from cached response
+        :param cached: cached response
+        :return: conditional headers
+        """
+        headers = {}
+        if cached.get('etag'):
+            headers[HTTP_HEADER_IF_NONE_MATCH] = cached['etag']
+        if cached.get('last_modified'):
+            headers[HTTP_HEADER_IF_MODIFIED_SINCE] = cached['last_modified']
+        return headers
+
+    def _cache_response(self, response):
+        """
+        Store response in HTTP cache if it has validators
+        :param response: HTTP response
+        :return:
+        """
+        etag = response.headers.get(HTTP_HEADER_ETAG)
+        last_modified = response.headers.get(HTTP_HEADER_LAST_MODIFIED)
+        if etag or last_modified:
+            self.http_cache.put(self.cache_key(), {'etag': etag, 'last_modified': last_modified,
+                                                   'content': response.content})
+
     def get_basic_authn_header(self):
         """
         Get basic authentication HTTP header
@@ -217,9 +334,56 @@ class RestResponse:
         else:
             return None
 
+    def resources(self, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        Get the entries of the collection resource from HTTP response one by one. The response body is parsed
+        incrementally, so that a streamed response is never held in memory as a whole.
+        :param chunk_size: number of bytes read at a time
+        :return: generator of entries
+        """
+        try:
+            for raw_entry in JsonStream.iter_array_items(self.response.iter_content(chunk_size), 'entries'):
+                yield RestResource.Resource(raw_entry)
+        finally:
+            self.response.close()
+
     def status(self):
         """
         Get response code of REST response
         :return:
         """
         return self.response.status_code
+
+
+class BufferedResponse(object):
+    """The class holds a completely read HTTP response"""
+
+    def __init__(self, status_code, headers, content):
+        """
+        Initialize buffered response
+        :param status_code: HTTP status code
+        :param headers: HTTP headers
+        :param content: response body in bytes
+        """
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def json(self):
+        """
+        Get the response body as JSON
+        :return: JSON object
+        """
+        return json.loads(self.content.decode('utf-8'))
+
+    def iter_content(self, chunk_size=1):
+        """
+        Iterate the response body in chunks
+        :param chunk_size: number of bytes in a chunk
+        :return: generator of chunks
+        """
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
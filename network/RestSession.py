@@ -0,0 +1,63 @@
+"""
+This is a module for pooled HTTP sessions shared by REST requests.
+"""
+
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_MAX_RETRIES = 0
+
+
+def create_session(pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                   max_retries=DEFAULT_MAX_RETRIES, pool_block=False):
+    """
+    Create a keep-alive HTTP session backed by a connection pool.
+    Connections, and so their TLS sessions, are reused across requests instead of being
+    re-established for each request.
+    :param pool_connections: number of hosts to keep connection pools for
+    :param pool_maxsize: maximum number of connections kept alive per host
+    :param max_retries: maximum number of retries for failed connections
+    :param pool_block: whether to block when no free connection is available in the pool
+    :return: the HTTP session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                          max_retries=max_retries, pool_block=pool_block)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def warm_up(session, uri, connections, headers=None):
+    """
+    Open connections to the host of the URI concurrently, so that they are kept alive in the pool
+    :param session: the HTTP session
+    :param uri: the URI to request
+    :param connections: number of connections to open
+    :param headers: HTTP headers of the warm-up requests
+    :return:
+    """
+    if connections <= 0:
+        return
+
+    logger.debug('    [Warm up %d connections to %s]', connections, uri)
+
+    def _head():
+        try:
+            session.head(uri, headers=headers)
+        except requests.RequestException as e:
+            logger.debug('    [Warm-up request failed: %s]', e)
+
+    threads = [threading.Thread(target=_head) for _ in range(connections)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
@@ -0,0 +1,89 @@
+import pytest
+
+from util import DqlUtility
+
+
+class TestSplitClauses:
+    def test_split_top_level_clauses(self):
+        clauses = DqlUtility.split_clauses(
+            "select r_object_id, object_name from dm_document where a = 1 order by object_name enable (RETURN_TOP 5)")
+        assert clauses == {'select': 'r_object_id, object_name', 'from': 'dm_document', 'where': 'a = 1',
+                           'order by': 'object_name', 'enable': '(RETURN_TOP 5)'}
+
+    def test_keywords_in_literals_are_skipped(self):
+        clauses = DqlUtility.split_clauses(
+            "select r_object_id from dm_document where object_name = 'from where order by' and title = 'o''where'")
+        assert clauses['from'] == 'dm_document'
+        assert clauses['where'] == "object_name = 'from where order by' and title = 'o''where'"
+
+    def test_keywords_in_sub_queries_are_skipped(self):
+        clauses = DqlUtility.split_clauses(
+            "select r_object_id from dm_document where r_object_id in "
+            "(select parent_id from dm_relation where relation_name = 'x')")
+        assert clauses['where'] == "r_object_id in (select parent_id from dm_relation where relation_name = 'x')"
+        assert 'order by' not in clauses
+
+    def test_keywords_in_names_are_skipped(self):
+        clauses = DqlUtility.split_clauses('select from_date, selected from dm_document where wherever = 1')
+        assert clauses == {'select': 'from_date, selected', 'from': 'dm_document', 'where': 'wherever = 1'}
+
+    def test_multi_word_keywords_with_any_spacing(self):
+        clauses = DqlUtility.split_clauses('SELECT r_object_id FROM dm_document ORDER  BY r_object_id')
+        assert clauses['order by'] == 'r_object_id'
+
+    def test_non_select_statement_is_rejected(self):
+        with pytest.raises(ValueError):
+            DqlUtility.split_clauses("update dm_document objects set title = 'x'")
+
+    def test_duplicate_clause_is_rejected(self):
+        with pytest.raises(ValueError):
+            DqlUtility.split_clauses('select r_object_id from dm_document where a = 1 where b = 2')
+
+    def test_join_clauses_in_order(self):
+        dql = 'select r_object_id from dm_document where a = 1 order by r_object_id'
+        assert DqlUtility.join_clauses(DqlUtility.split_clauses(dql)) == dql
+
+
+class TestKeysetQuery:
+    def test_first_page(self):
+        assert DqlUtility.keyset_query('select object_name from dm_document', page_size=10) == \
+            'select r_object_id, object_name from dm_document order by r_object_id enable (RETURN_TOP 10)'
+
+    def test_next_page_seeks_after_last_key(self):
+        assert DqlUtility.keyset_query("select r_object_id from dm_document where title = 'order by'",
+                                       '0900000180000001') == \
+            "select r_object_id from dm_document where (title = 'order by') and r_object_id > '0900000180000001' " \
+            "order by r_object_id"
+
+    def test_hint_is_merged_into_enable(self):
+        assert DqlUtility.keyset_query('select r_object_id from dm_document enable (FETCH_ALL_RESULTS 0)',
+                                       page_size=5).endswith('enable (FETCH_ALL_RESULTS 0, RETURN_TOP 5)')
+
+    @pytest.mark.parametrize('dql', ['select r_object_id from dm_document order by object_name',
+                                     'select owner_name, count(*) from dm_document group by owner_name',
+                                     'select distinct object_name from dm_document',
+                                     'SELECT DISTINCT r_object_id FROM dm_document'])
+    def test_unsupported_dql_is_rejected(self, dql):
+        with pytest.raises(ValueError):
+            DqlUtility.keyset_query(dql)
+
+
+class TestPaths:
+    def test_split_path(self):
+        assert DqlUtility.split_path('/Temp/a/b') == ('/Temp/a', 'b')
+        assert DqlUtility.split_path('/Temp/') == (None, 'Temp')
+
+    @pytest.mark.parametrize('path', ['', '/', 'Temp/a'])
+    def test_invalid_path_is_rejected(self, path):
+        with pytest.raises(ValueError):
+            DqlUtility.split_path(path)
+
+    def test_path_query_quotes_names(self):
+        assert DqlUtility.path_query("/Temp/it's") == \
+            "select r_object_id from dm_sysobject where object_name = 'it''s' and folder('/Temp')"
+        assert DqlUtility.path_query('/Temp') == "select r_object_id from dm_cabinet where object_name = 'Temp'"
+
+    def test_object_id_shards_are_disjoint_and_complete(self):
+        shards = DqlUtility.object_id_shards(3)
+        digits = [digit for shard in shards for digit in shard.split("'%")[1:]]
+        assert sorted(digit[0] for digit in digits) == sorted('0123456789abcdef')
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from util import JsonStream
+
+
+def _chunks(document, size):
+    data = json.dumps(document).encode('utf-8') if not isinstance(document, bytes) else document
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+DOCUMENT = {
+    'id': 'http://host/repositories/REPO/objects',
+    'title': 'entries: [not this one]',
+    'links': [{'rel': 'self', 'href': 'http://host/entries'}],
+    'nested': {'entries': [{'id': 'nested'}]},
+    'entries': [
+        {'id': 1, 'title': 'café 中文', 'content': {'properties': {'object_name': 'a "quoted" ] name'}}},
+        {'id': 2, 'title': 'back\\slash', 'links': []},
+        'text',
+        12345,
+        -1.5e3,
+        True,
+        None,
+    ],
+    'total': 7,
+}
+
+
+class TestIterArrayItems:
+    @pytest.mark.parametrize('size', [1, 2, 3, 7, 64, 4096])
+    def test_items_across_chunk_boundaries(self, size):
+        assert list(JsonStream.iter_array_items(_chunks(DOCUMENT, size), 'entries')) == DOCUMENT['entries']
+
+    @pytest.mark.parametrize('size', [1, 5])
+    def test_number_split_at_chunk_boundary(self, size):
+        items = list(JsonStream.iter_array_items(_chunks({'entries': [1234567890, 98765]}, size), 'entries'))
+        assert items == [1234567890, 98765]
+
+    def test_multi_byte_character_split_at_chunk_boundary(self):
+        data = json.dumps({'entries': ['中文']}, ensure_ascii=False).encode('utf-8')
+        assert list(JsonStream.iter_array_items(_chunks(data, 1), 'entries')) == ['中文']
+
+    def test_empty_chunks_are_skipped(self):
+        chunks = [b'', b'{"entries": [', b'', b'1, 2', b'', b']}', b'']
+        assert list(JsonStream.iter_array_items(chunks, 'entries')) == [1, 2]
+
+    def test_empty_array(self):
+        assert list(JsonStream.iter_array_items(_chunks({'entries': []}, 3), 'entries')) == []
+
+    def test_missing_key(self):
+        assert list(JsonStream.iter_array_items(_chunks({'links': [1, 2]}, 3), 'entries')) == []
+
+    def test_key_in_nested_object_or_string_is_ignored(self):
+        document = {'a': {'entries': [1]}, 'b': 'entries', 'c': ['entries', 2]}
+        assert list(JsonStream.iter_array_items(_chunks(document, 2), 'entries')) == []
+
+    def test_unclosed_array(self):
+        with pytest.raises(ValueError):
+            list(JsonStream.iter_array_items([b'{"entries": [{"id": 1}, '], 'entries'))
+
+    def test_truncated_item(self):
+        with pytest.raises(ValueError):
+            list(JsonStream.iter_array_items([b'{"entries": [{"id": 1}, {"id"'], 'entries'))
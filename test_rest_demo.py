@@ -37,6 +37,12 @@ class TestRestDemo:
     def test_version_mgt(self, demo):
         demo.demo_version_management()
 
+    def test_bulk_operations(self, demo):
+        demo.demo_bulk_operations()
+
+    def test_concurrent_access(self, demo):
+        demo.demo_concurrent_access()
+
     def test_dql(self, demo):
         demo.demo_dql()
 
@@ -0,0 +1,332 @@
+"""
+This is a module to export repository objects to a local directory in bulk.
+"""
+
+import collections
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from model import RestLink
+from model import RestResource
+from network.RestClient import DEFAULT_BATCH_SIZE
+from util.Journal import Journal
+
+__author__ = 'wangc31'
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+DEFAULT_METADATA_WORKERS = 4
+DEFAULT_CONTENT_WORKERS = 8
+METADATA_FILE = 'metadata.jsonl'
+JOURNAL_FILE = 'export.journal'
+CONTENT_DIR = 'content'
+
+STATE_DONE = 'done'
+
+
+class ExportReport(collections.namedtuple('ExportReport', ['objects', 'contents', 'skipped', 'failed', 'bytes',
+                                                           'seconds'])):
+    """
+    This class is the report of a bulk export. Objects, contents and bytes count what is exported by this run,
+    skipped counts the objects exported by previous runs, and failed is a list of tuples (r_object_id, error).
+    """
+
+    __slots__ = ()
+
+    @property
+    def objects_per_second(self):
+        return self.objects / self.seconds if self.seconds else 0.0
+
+    @property
+    def bytes_per_second(self):
+        return self.bytes / self.seconds if self.seconds else 0.0
+
+
+class BulkExporter(object):
+    """
+    This class exports the objects of a folder tree, DQL query or saved search to a local directory. The properties
+    of each object are appended as one JSON line to metadata.jsonl, and its primary content, or all its contents
+    with renditions, are downloaded to content/<last 2 digits of r_object_id>/<r_object_id>.p<page>
+    [.<page modifier>].<format>.
+
+    The stages are pipelined on bounded worker pools: the listing of objects is paged in the calling thread,
+    objects known by their ids only are fetched in chunks by the metadata workers, and contents are downloaded by
+    the content workers, so that each stage runs while the others wait for the network. Exported objects are
+    recorded in export.journal, and a rerun after interruption skips them.
+    Size pool_maxsize of the REST client to at least metadata_workers + content_workers.
+    """
+
+    def __init__(self, client, output_dir, renditions=False, metadata_workers=DEFAULT_METADATA_WORKERS,
+                 content_workers=DEFAULT_CONTENT_WORKERS, chunk_size=DEFAULT_BATCH_SIZE):
+        """
+        Initialize bulk exporter
+        :param client: the REST client
+        :param output_dir: path of the local directory to export to
+        :param renditions: whether to download all contents of the objects, or else only their primary contents
+        :param metadata_workers: maximum number of concurrent chunks of objects fetched by their ids
+        :param content_workers: maximum number of concurrent content downloads
+        :param chunk_size: number of objects fetched in one chunk by their ids
+        """
+        self._client = client
+        self._output_dir = output_dir
+        self._renditions = renditions
+        self._metadata_workers = metadata_workers
+        self._content_workers = content_workers
+        self._chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self._journal = None
+        self._metadata_file = None
+        self._counts = None
+        self._failed = None
+
+    def export_folder(self, folder, params=None):
+        """
+        Export the objects of a folder and all its sub-folders
+        :param folder: the folder
+        :param params: URL parameters to list the folders, e.g. items-per-page
+        :return: ExportReport
+        """
+        def _list():
+            for _, _, objects in self._client.walk(folder, params=params, max_workers=self._metadata_workers):
+                for obj in objects:
+                    yield obj
+
+        return self._run(_list())
+
+    def export_dql(self, dql, page_size=DEFAULT_BATCH_SIZE):
+        """
+        Export the objects queried by DQL, which are paged with keyset pagination
+        :param dql: DQL statement which selects r_object_id, without order by or group by clause
+        :param page_size: number of results in each page
+        :return: ExportReport
+        """
+        return self._run(entry.get('content').get('properties').get('r_object_id')
+                         for entry in self._client.dql_keyset(dql, page_size))
+
+    def export_saved_search(self, saved_search, params=None):
+        """
+        Export the objects found by a saved search across all pages of its results
+        :param saved_search: the saved search
+        :param params: URL parameters to execute the saved search, e.g. items-per-page
+        :return: ExportReport
+        """
+        results = self._client.execute_saved_search(saved_search, params=params)
+        return self._run(_get_object_id(entry) for entry in self._client.iter_entries(results))
+
+    def _run(self, listing):
+        """
+        Export the listed objects
+        :param listing: iterable of objects, or of r_object_id of objects to fetch
+        :return: ExportReport
+        """
+        start = time.time()
+        self._counts = collections.Counter()
+        self._failed = []
+        if not os.path.isdir(self._output_dir):
+            os.makedirs(self._output_dir)
+
+        metadata_pool = _BoundedExecutor(self._metadata_workers)
+        content_pool = _BoundedExecutor(self._content_workers)
+        with Journal(os.path.join(self._output_dir, JOURNAL_FILE)) as self._journal, \
+                open(os.path.join(self._output_dir, METADATA_FILE), 'a') as self._metadata_file:
+            try:
+                chunk = []
+                # objects linked into several folders, or listed again by a query, are exported once
+                seen = set()
+                for item in listing:
+                    is_object = isinstance(item, RestResource.Resource)
+                    object_id = item.get('properties').get('r_object_id') if is_object else item
+                    if object_id in seen or self._is_exported(object_id):
+                        continue
+                    seen.add(object_id)
+
+                    if is_object:
+                        content_pool.submit(self._export_object, item)
+                    else:
+                        chunk.append(item)
+                        if len(chunk) == self._chunk_size:
+                            metadata_pool.submit(self._fetch_objects, chunk, content_pool)
+                            chunk = []
+
+                if chunk:
+                    metadata_pool.submit(self._fetch_objects, chunk, content_pool)
+            finally:
+                metadata_pool.shutdown()
+                content_pool.shutdown()
+
+        report = ExportReport(self._counts['objects'], self._counts['contents'], self._counts['skipped'],
+                              self._failed, self._counts['bytes'], time.time() - start)
+        logger.info('Exported %d objects and %d contents (%d skipped, %d failed) in %.1f seconds: '
+                    '%.1f objects/s, %.1f MB/s.', report.objects, report.contents, report.skipped,
+                    len(report.failed), report.seconds, report.objects_per_second, report.bytes_per_second / 1e6)
+        return report
+
+    def _is_exported(self, object_id):
+        entry = self._journal.get(object_id)
+        if entry is not None and entry['state'] == STATE_DONE:
+            self._count('skipped')
+            return True
+        return False
+
+    def _fetch_objects(self, object_ids, content_pool):
+        """
+        Fetch a chunk of objects by their ids, and queue them for content download
+        :param object_ids: r_object_id of the objects
+        :param content_pool: executor of content downloads
+        :return:
+        """
+        try:
+            result = self._client.get_objects(object_ids, max_workers=1)
+        except Exception as e:
+            for object_id in object_ids:
+                self._fail(object_id, e)
+            return
+
+        for object_id in result.missing:
+            self._fail(object_id, Exception('Object is not found.'))
+        for obj in result.objects:
+            if obj is not None:
+                content_pool.submit(self._export_object, obj)
+
+    def _export_object(self, obj):
+        """
+        Download the contents of an object, and write its metadata
+        :param obj: the object
+        :return:
+        """
+        object_id = obj.get('properties').get('r_object_id')
+        try:
+            contents = [self._download(object_id, content) for content in self._get_contents(obj)]
+        except Exception as e:
+            self._fail(object_id, e)
+            return
+
+        line = json.dumps({'r_object_id': object_id, 'properties': obj.get('properties'), 'contents': contents})
+        with self._lock:
+            self._metadata_file.write(line + '\n')
+            self._metadata_file.flush()
+        self._journal.record(object_id, state=STATE_DONE)
+        self._count('objects')
+
+    def _get_contents(self, obj):
+        """
+        Get the content resources of an object to download
+        :param obj: the object
+        :return: list of content resources
+        """
+        if obj.get('properties').get('r_content_size') == 0:
+            return []
+
+        if self._renditions:
+            if obj.find_link(RestLink.REL_CONTENTS) is None:
+                return []
+            contents = self._client.get_contents(obj, params={'inline': 'true'})
+            return [self._client.get_entry_resource(entry) for entry in self._client.iter_entries(contents)]
+
+        if obj.find_link(RestLink.REL_PRIMARY_CONTENT) is None:
+            return []
+        return [self._client.get_primary_content(obj)]
+
+    def _download(self, object_id, content):
+        """
+        Download a content to a file. It is written to a temporary file first, so that no partial file is left.
+        :param object_id: r_object_id of the object owning the content
+        :param content: the content resource
+        :return: description of the downloaded content with its path relative to the output directory
+        """
+        properties = content.get('properties') or {}
+        page = _get_page(properties)
+        # pages of the same format, e.g. of a multi-page TIFF, only differ in page number
+        name = '.'.join(part for part in (object_id, 'p%d' % page, properties.get('page_modifier'),
+                                          properties.get('format_name')) if part)
+        relative_path = '/'.join((CONTENT_DIR, object_id[-2:], name))
+        path = os.path.join(self._output_dir, *relative_path.split('/'))
+
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # created by another worker
+                if not os.path.isdir(directory):
+                    raise
+
+        temp_path = path + '.part'
+        with open(temp_path, 'wb') as f:
+            size = self._client.download_content(content, f)
+        if os.path.exists(path):
+            os.remove(path)
+        os.rename(temp_path, path)
+
+        self._count('contents')
+        self._count('bytes', size)
+        return {'format': properties.get('format_name'), 'page': page,
+                'page_modifier': properties.get('page_modifier'), 'path': relative_path, 'size': size}
+
+    def _count(self, name, value=1):
+        with self._lock:
+            self._counts[name] += value
+
+    def _fail(self, object_id, error):
+        logger.warning('Failed to export %s: %s', object_id, error)
+        with self._lock:
+            self._failed.append((object_id, error))
+
+
+class _BoundedExecutor(object):
+    """
+    This class is a thread pool whose submit blocks while all workers are busy and as many tasks are queued,
+    so that a fast stage of a pipeline can not queue up unbounded work for a slow one
+    """
+
+    def __init__(self, max_workers):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._semaphore = threading.BoundedSemaphore(max_workers * 2)
+
+    def submit(self, func, *args):
+        self._semaphore.acquire()
+        try:
+            future = self._executor.submit(func, *args)
+        except Exception:
+            self._semaphore.release()
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    def _done(self, future):
+        self._semaphore.release()
+        if future.exception() is not None:
+            logger.error('Export task failed: %s', future.exception())
+
+
+def _get_object_id(entry):
+    """
+    Get r_object_id of a search result or query result entry
+    :param entry: the entry
+    :return: r_object_id
+    """
+    content = entry.get('content') or {}
+    properties = content.get('properties') or {}
+    if properties.get('r_object_id'):
+        return properties.get('r_object_id')
+    return entry.find_link(RestLink.REL_EDIT).href.rstrip('/').rsplit('/', 1)[-1]
+
+
+def _get_page(properties):
+    """
+    Get the page number of a content, which is repeating in content properties with one value per parent
+    :param properties: properties of the content resource
+    :return: page number; 0 if it is unknown
+    """
+    page = properties.get('page')
+    if isinstance(page, list):
+        page = page[0] if page else None
+    return int(page) if page is not None else 0
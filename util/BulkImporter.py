@@ -0,0 +1,301 @@
+"""
+This is a module to import a local directory tree into a repository folder in bulk.
+"""
+
+import collections
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from util import ResourceUtility
+from util.Journal import Journal
+
+__author__ = 'wangc31'
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+DEFAULT_IMPORT_WORKERS = 8
+METADATA_SUFFIX = '.metadata.json'
+
+# journal states of an item
+STATE_STARTED = 'started'
+STATE_DONE = 'done'
+
+
+class ImportReport(collections.namedtuple('ImportReport', ['folders', 'documents', 'skipped', 'failed', 'bytes',
+                                                           'seconds'])):
+    """
+    This class is the report of a bulk import. Folders, documents and bytes count what is imported by this run,
+    skipped counts the items imported by previous runs, and failed is a list of tuples (local path, error).
+    """
+
+    __slots__ = ()
+
+    @property
+    def documents_per_second(self):
+        return self.documents / self.seconds if self.seconds else 0.0
+
+    @property
+    def bytes_per_second(self):
+        return self.bytes / self.seconds if self.seconds else 0.0
+
+
+class BulkImporter(object):
+    """
+    This class mirrors a local directory tree into a repository folder. Folders are created level by level, with
+    the folders of a level created concurrently, and then documents are created with their content concurrently
+    on a bounded worker pool. Files are streamed from a second walk of the tree into the pool, so only the
+    directories are held in memory however many files there are. Properties of a folder or document are read from
+    the optional sidecar JSON file <name>.metadata.json next to it, e.g.
+    {"title": "report", "r_object_type": "my_document"}.
+
+    With a journal file, every created object is recorded, and a rerun after interruption skips them. Documents
+    which were being created when the job was interrupted are looked up by name before they are created again.
+    Size pool_maxsize of the REST client to at least max_workers.
+    """
+
+    def __init__(self, client, journal_path=None, max_workers=DEFAULT_IMPORT_WORKERS, formats=None,
+                 default_format=None):
+        """
+        Initialize bulk importer
+        :param client: the REST client
+        :param journal_path: path of the journal file to resume from; the progress is not persisted if None
+        :param max_workers: maximum number of concurrent requests
+        :param formats: dictionary from file extension like .txt to repository format name like crtext
+        :param default_format: format name of files whose extensions are not in formats; the server decides if None
+        """
+        self._client = client
+        self._journal_path = journal_path
+        self._max_workers = max_workers
+        self._formats = dict((extension.lower(), format_name) for extension, format_name in (formats or {}).items())
+        self._default_format = default_format
+        self._lock = threading.Lock()
+        self._journal = None
+        self._folders = None
+        self._counts = None
+        self._failed = None
+
+    def run(self, local_dir, target_folder):
+        """
+        Import the local directory tree into the target folder
+        :param local_dir: path of the local directory, whose content is imported
+        :param target_folder: the repository folder to import into
+        :return: ImportReport
+        """
+        start = time.time()
+        self._folders = {'': target_folder}
+        self._counts = collections.Counter()
+        self._failed = []
+
+        levels = _scan_dirs(local_dir)
+        logger.info('Import %d folders and their files from %s.', sum(len(level) for level in levels), local_dir)
+
+        with Journal(self._journal_path) as self._journal:
+            for level in levels:
+                self._run_bounded(self._import_folder, level)
+            self._run_bounded(self._import_document, _iter_files(local_dir))
+
+        report = ImportReport(self._counts['folders'], self._counts['documents'], self._counts['skipped'],
+                              self._failed, self._counts['bytes'], time.time() - start)
+        logger.info('Imported %d folders and %d documents (%d skipped, %d failed) in %.1f seconds: '
+                    '%.1f documents/s, %.1f MB/s.', report.folders, report.documents, report.skipped,
+                    len(report.failed), report.seconds, report.documents_per_second, report.bytes_per_second / 1e6)
+        return report
+
+    def _import_folder(self, item):
+        """
+        Create a folder, or find it if it is created by a previous run
+        :param item: tuple of relative path and local path of the directory
+        :return:
+        """
+        relative_path, local_path = item
+        entry = self._journal.get(relative_path)
+        if entry is not None and entry['state'] == STATE_DONE:
+            self._count('skipped')
+            return
+
+        try:
+            parent = self._get_folder(_parent_of(relative_path))
+            properties = dict(_read_metadata(local_path), object_name=os.path.basename(local_path))
+            try:
+                folder = self._client.create_folder(parent, ResourceUtility.generate_sysobject(
+                    properties.pop('r_object_type', 'dm_folder'), **properties))
+            except Exception:
+                # the folder may be created by an interrupted run before it is journaled
+                folder = self._client.get_folder(parent, properties['object_name'])
+                if folder is None:
+                    raise
+        except Exception as e:
+            self._fail(local_path, e)
+            return
+
+        with self._lock:
+            self._folders[relative_path] = folder
+        self._journal.record(relative_path, state=STATE_DONE, id=folder.get('properties').get('r_object_id'))
+        self._count('folders')
+
+    def _import_document(self, item):
+        """
+        Create a document with its content, unless it is created by a previous run
+        :param item: tuple of relative path and local path of the file
+        :return:
+        """
+        relative_path, local_path = item
+        entry = self._journal.get(relative_path)
+        if entry is not None and entry['state'] == STATE_DONE:
+            self._count('skipped')
+            return
+
+        try:
+            parent = self._get_folder(_parent_of(relative_path))
+            properties = dict(_read_metadata(local_path), object_name=os.path.basename(local_path))
+            document = None
+            if entry is not None:
+                document = self._client.get_document(parent, properties['object_name'])
+
+            if document is None:
+                self._journal.record(relative_path, state=STATE_STARTED)
+                document = self._create_document(parent, local_path, properties)
+                self._count('bytes', os.path.getsize(local_path))
+        except Exception as e:
+            self._fail(local_path, e)
+            return
+
+        self._journal.record(relative_path, state=STATE_DONE, id=document.get('properties').get('r_object_id'))
+        self._count('documents')
+
+    def _create_document(self, parent, local_path, properties):
+        """
+        Create a document with the content of a file
+        :param parent: the parent folder
+        :param local_path: path of the file
+        :param properties: properties of the document
+        :return: created document
+        """
+        new_doc = ResourceUtility.generate_sysobject(properties.pop('r_object_type', 'dm_document'), **properties)
+        format_name = self._formats.get(os.path.splitext(local_path)[1].lower(), self._default_format)
+        params = {'format': format_name} if format_name else None
+
+        if os.path.getsize(local_path) == 0:
+            return self._client.create_document(parent, new_doc, params=params)
+
+        with open(local_path, 'rb') as f:
+            return self._client.create_document(parent, new_doc, content=f, params=params)
+
+    def _get_folder(self, relative_path):
+        """
+        Get an imported folder. Folders imported by previous runs are fetched by their journaled ids.
+        :param relative_path: relative path of the folder
+        :return: the folder
+        """
+        with self._lock:
+            folder = self._folders.get(relative_path)
+        if folder is not None:
+            return folder
+
+        entry = self._journal.get(relative_path)
+        if entry is None or entry['state'] != STATE_DONE:
+            raise Exception('Folder %s is not imported.' % relative_path)
+
+        folder = self._client.get_object_by_id(entry['id'])
+        with self._lock:
+            self._folders[relative_path] = folder
+        return folder
+
+    def _run_bounded(self, func, items):
+        """
+        Run func for each item concurrently, while at most max_workers items are in flight, so that millions of
+        items do not queue up in memory
+        :param func: the function, which handles its own errors
+        :param items: the items
+        :return:
+        """
+        executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        try:
+            running = set()
+            for item in items:
+                if len(running) >= self._max_workers:
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                running.add(executor.submit(func, item))
+            for future in running:
+                future.result()
+        finally:
+            executor.shutdown(wait=True)
+
+    def _count(self, name, value=1):
+        with self._lock:
+            self._counts[name] += value
+
+    def _fail(self, local_path, error):
+        logger.warning('Failed to import %s: %s', local_path, error)
+        with self._lock:
+            self._failed.append((local_path, error))
+
+
+def _scan_dirs(local_dir):
+    """
+    Scan the directories of the local directory tree
+    :param local_dir: path of the local directory
+    :return: the directories grouped by level; each item is a tuple of the relative path with / as separator and
+             the local path
+    """
+    levels = []
+    for relative_dir, dir_path, dir_names, _ in _walk(local_dir):
+        depth = relative_dir.count('/') + 1 if relative_dir else 0
+        while dir_names and len(levels) <= depth:
+            levels.append([])
+        for name in dir_names:
+            levels[depth].append((_join(relative_dir, name), os.path.join(dir_path, name)))
+    return levels
+
+
+def _iter_files(local_dir):
+    """
+    Iterate the files of the local directory tree, except sidecar metadata files
+    :param local_dir: path of the local directory
+    :return: generator of tuples of the relative path with / as separator and the local path
+    """
+    for relative_dir, dir_path, _, file_names in _walk(local_dir):
+        for name in file_names:
+            if not name.endswith(METADATA_SUFFIX):
+                yield _join(relative_dir, name), os.path.join(dir_path, name)
+
+
+def _walk(local_dir):
+    """
+    Walk the local directory tree in a stable order
+    :param local_dir: path of the local directory
+    :return: generator of tuples of the relative directory path, the local directory path, and the sorted names of
+             its sub-directories and files
+    """
+    for dir_path, dir_names, file_names in os.walk(local_dir):
+        dir_names.sort()
+        relative_dir = os.path.relpath(dir_path, local_dir).replace(os.sep, '/')
+        yield '' if relative_dir == '.' else relative_dir, dir_path, dir_names, sorted(file_names)
+
+
+def _read_metadata(local_path):
+    """
+    Read the properties of a file or directory from its sidecar file
+    :param local_path: path of the file or directory
+    :return: dictionary of the properties; empty if there is no sidecar file
+    """
+    metadata_path = local_path + METADATA_SUFFIX
+    if not os.path.isfile(metadata_path):
+        return {}
+    with open(metadata_path) as f:
+        return json.load(f)
+
+
+def _join(relative_dir, name):
+    return '%s/%s' % (relative_dir, name) if relative_dir else name
+
+
+def _parent_of(relative_path):
+    return relative_path.rpartition('/')[0]
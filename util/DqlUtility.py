@@ -0,0 +1,166 @@
+"""
+This is a module to rewrite DQL statements.
+"""
+
+import re
+
+__author__ = 'wangc31'
+
+KEYSET_KEY = 'r_object_id'
+
+_CLAUSES = ('select', 'from', 'where', 'group by', 'having', 'order by', 'enable')
+
+
+def split_clauses(dql):
+    """
+    Split DQL into its top level clauses. Keywords in string literals and parentheses, e.g. sub-queries, are skipped.
+    :param dql: DQL statement
+    :return: dictionary from clause keyword to clause body
+    """
+    positions = []
+    depth = 0
+    in_literal = False
+    lower_dql = dql.lower()
+    i = 0
+    while i < len(dql):
+        char = dql[i]
+        if char == '\'':
+            in_literal = not in_literal
+        elif not in_literal and char == '(':
+            depth += 1
+        elif not in_literal and char == ')':
+            depth -= 1
+        elif not in_literal and depth == 0 and (i == 0 or not _is_word_char(dql[i - 1])):
+            for clause in _CLAUSES:
+                match = re.match(clause.replace(' ', r'\s+') + r'\b', lower_dql[i:])
+                if match:
+                    positions.append((i, i + match.end(), clause))
+                    i += match.end() - 1
+                    break
+        i += 1
+
+    clauses = {}
+    for index, (start, end, clause) in enumerate(positions):
+        if clause in clauses:
+            raise ValueError('Clause %s appears more than once in DQL: %s' % (clause, dql))
+        stop = positions[index + 1][0] if index + 1 < len(positions) else len(dql)
+        clauses[clause] = dql[end:stop].strip()
+
+    if 'select' not in clauses or 'from' not in clauses:
+        raise ValueError('Only DQL select statements are supported: %s' % dql)
+
+    return clauses
+
+
+def join_clauses(clauses):
+    """
+    Join DQL clauses into DQL statement
+    :param clauses: dictionary from clause keyword to clause body
+    :return: DQL statement
+    """
+    return ' '.join('%s %s' % (clause, clauses[clause]) for clause in _CLAUSES if clauses.get(clause))
+
+
+def add_condition(dql, condition):
+    """
+    Add a condition to the where clause of DQL
+    :param dql: DQL statement
+    :param condition: the condition
+    :return: DQL statement
+    """
+    clauses = split_clauses(dql)
+    clauses['where'] = _and(clauses.get('where'), condition)
+    return join_clauses(clauses)
+
+
+def keyset_query(dql, last_key=None, page_size=None):
+    """
+    Rewrite DQL to get the page of results after the last seen key, by ordering on the key and seeking with
+    key > last_key. The DQL must not have its own order by or group by clause, nor select distinct.
+    :param dql: DQL statement
+    :param last_key: the key of the last result of previous page; None for the first page
+    :param page_size: the number of results in a page, which is passed to the server as hint RETURN_TOP
+    :return: DQL statement
+    """
+    clauses = split_clauses(dql)
+    for clause in ('order by', 'group by', 'having'):
+        if clause in clauses:
+            raise ValueError('Keyset pagination does not support DQL with %s clause: %s' % (clause, dql))
+
+    if re.match(r'distinct\b', clauses['select'].lower()):
+        raise ValueError('Keyset pagination does not support DQL with distinct: %s' % dql)
+
+    columns = [column.strip().lower() for column in clauses['select'].split(',')]
+    if '*' not in columns and KEYSET_KEY not in columns:
+        clauses['select'] = '%s, %s' % (KEYSET_KEY, clauses['select'])
+
+    if last_key is not None:
+        clauses['where'] = _and(clauses.get('where'), '%s > %s' % (KEYSET_KEY, quote(last_key)))
+
+    clauses['order by'] = KEYSET_KEY
+
+    if page_size:
+        hint = 'RETURN_TOP %d' % page_size
+        enable = clauses.get('enable')
+        clauses['enable'] = '(%s, %s)' % (enable.strip()[1:-1], hint) if enable else '(%s)' % hint
+
+    return join_clauses(clauses)
+
+
+def object_id_shards(shard_count):
+    """
+    Get conditions which split objects into disjoint shards by the last hexadecimal digit of r_object_id
+    :param shard_count: number of shards, from 1 to 16
+    :return: list of conditions, one for each shard
+    """
+    if not 1 <= shard_count <= 16:
+        raise ValueError('Objects can be split into 1 to 16 shards by r_object_id, but not %d.' % shard_count)
+
+    digits = '0123456789abcdef'
+    return ['(%s)' % ' or '.join('%s like \'%%%s\'' % (KEYSET_KEY, digit) for digit in digits[i::shard_count])
+            for i in range(shard_count)]
+
+
+def split_path(path):
+    """
+    Split repository path into the path of its parent folder and its object name, e.g. /Temp/a/b into /Temp/a and b
+    :param path: repository path, which starts with /
+    :return: tuple of parent path and object name; parent path is None for cabinets
+    """
+    names = [name for name in path.split('/') if name]
+    if not path.startswith('/') or not names:
+        raise ValueError('Repository path must start with / and name an object: %s' % path)
+
+    parent = '/' + '/'.join(names[:-1]) if len(names) > 1 else None
+    return parent, names[-1]
+
+
+def path_query(path):
+    """
+    Get DQL which queries the r_object_id of the object at the repository path
+    :param path: repository path
+    :return: DQL statement
+    """
+    parent, name = split_path(path)
+    if parent is None:
+        return 'select r_object_id from dm_cabinet where object_name = %s' % quote(name)
+    return 'select r_object_id from dm_sysobject where object_name = %s and folder(%s)' % (quote(name), quote(parent))
+
+
+def quote(value):
+    """
+    Quote a value as DQL string literal
+    :param value: the value
+    :return: DQL string literal
+    """
+    return '\'%s\'' % str(value).replace('\'', '\'\'')
+
+
+def _and(condition, other):
+    if condition:
+        return '(%s) and %s' % (condition, other)
+    return other
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
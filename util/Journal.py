@@ -0,0 +1,94 @@
+"""
+This is a module to journal the progress of bulk jobs.
+"""
+
+import json
+import logging
+import threading
+
+__author__ = 'wangc31'
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class Journal(object):
+    """
+    This class records the progress of a bulk job as JSON lines appended to a file, one entry per line, so that an
+    interrupted job can resume by skipping the items recorded as done. The last entry of a key wins.
+    It is thread-safe.
+    """
+
+    def __init__(self, path=None):
+        """
+        Initialize journal, and load the entries recorded by previous runs
+        :param path: path of the journal file; the journal is in memory only if None
+        """
+        self._path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._file = None
+        if path:
+            self._load()
+            self._file = open(path, 'a')
+
+    def get(self, key):
+        """
+        Get the last entry of a key
+        :param key: the key
+        :return: the entry; None if the key is not recorded
+        """
+        with self._lock:
+            return self._entries.get(key)
+
+    def record(self, key, **values):
+        """
+        Record an entry of a key, and flush it to the file
+        :param key: the key
+        :param values: values of the entry
+        :return: the entry
+        """
+        entry = dict(values, key=key)
+        with self._lock:
+            self._entries[key] = entry
+            if self._file is not None:
+                self._file.write(json.dumps(entry) + '\n')
+                self._file.flush()
+        return entry
+
+    def close(self):
+        """
+        Close the journal file
+        :return:
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _load(self):
+        """
+        Load the entries from the file. A partial last line, written when a job is killed, is skipped.
+        :return:
+        """
+        try:
+            with open(self._path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        logger.warning('Skip malformed line of journal %s: %s', self._path, line.strip())
+                        continue
+                    self._entries[entry['key']] = entry
+        except (IOError, OSError) as e:
+            logger.debug('    [Journal is not loaded from %s: %s]', self._path, e)
@@ -0,0 +1,139 @@
+"""
+This is a module to parse large JSON documents incrementally.
+"""
+
+import codecs
+import json
+
+__author__ = 'wangc31'
+
+_WHITESPACE = ' \t\n\r'
+
+
+def iter_array_items(chunks, key):
+    """
+    Parse a JSON object incrementally from chunks of bytes and yield the items of its top level array one by one,
+    so that only one item at a time is held in memory rather than the whole document.
+    :param chunks: iterable of bytes chunks of the JSON object
+    :param key: the top level key of the array
+    :return: generator of array items
+    """
+    reader = _ChunkReader(chunks)
+
+    if not _seek_array(reader, key):
+        return
+
+    decoder = json.JSONDecoder()
+    while True:
+        reader.skip(_WHITESPACE + ',')
+        if not reader.ensure(1):
+            raise ValueError('JSON array %s is not closed.' % key)
+        if reader.peek() == ']':
+            return
+
+        while True:
+            try:
+                item, end = decoder.raw_decode(reader.buffer, reader.pos)
+                # a scalar is complete only if a delimiter follows it
+                if isinstance(item, (dict, list)) or reader.exhausted or (
+                        end < len(reader.buffer) and reader.buffer[end] in _WHITESPACE + ',]'):
+                    break
+            except ValueError:
+                if reader.exhausted:
+                    raise
+            reader.read()
+
+        reader.pos = end
+        reader.compact()
+        yield item
+
+
+def _seek_array(reader, key):
+    """
+    Move the reader behind the opening bracket of the top level array
+    :param reader: the chunk reader
+    :param key: the top level key of the array
+    :return: True if the array is found
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+    string_start = 0
+    last_string = None
+    while reader.ensure(1):
+        char = reader.peek()
+        reader.pos += 1
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+                last_string = reader.buffer[string_start:reader.pos - 1]
+        elif char == '"':
+            in_string = True
+            string_start = reader.pos
+        elif char in '{[':
+            depth += 1
+        elif char in '}]':
+            depth -= 1
+        elif char == ':' and depth == 1 and last_string == key:
+            reader.skip(_WHITESPACE)
+            if reader.ensure(1) and reader.peek() == '[':
+                reader.pos += 1
+                reader.compact()
+                return True
+        elif char == ',':
+            last_string = None
+    return False
+
+
+class _ChunkReader(object):
+    """This class buffers decoded text of byte chunks"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.exhausted = False
+
+    def read(self):
+        """
+        Append next chunk to the buffer
+        :return: False if there is no more chunk
+        """
+        for chunk in self._chunks:
+            if chunk:
+                self.buffer += self._decoder.decode(chunk)
+                return True
+        self.buffer += self._decoder.decode(b'', final=True)
+        self.exhausted = True
+        return False
+
+    def ensure(self, count):
+        """
+        Read until the buffer has count characters after the position
+        :param count: number of characters
+        :return: False if the stream ends before
+        """
+        while len(self.buffer) - self.pos < count:
+            if not self.read():
+                return len(self.buffer) - self.pos >= count
+        return True
+
+    def peek(self):
+        return self.buffer[self.pos]
+
+    def skip(self, chars):
+        while self.ensure(1) and self.peek() in chars:
+            self.pos += 1
+
+    def compact(self):
+        """
+        Drop the consumed characters from the buffer
+        :return:
+        """
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
@@ -49,9 +49,9 @@ def generate_assist_value_request(**properties):
     return _generate_resource(properties=properties)
 
 
-def generate_batch_request(*operations):
+def generate_batch_request(*operations, **options):
     batch_operations = [operation.raw_resource() for operation in operations]
-    batch_request = {'operations': batch_operations}
+    batch_request = dict(options, operations=batch_operations)
     return _generate_resource(**batch_request)
 
 